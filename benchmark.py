@@ -8,15 +8,21 @@ and read/write I/O for every major subsystem.
 Usage:
     python3 benchmark.py              # Run all benchmarks
     python3 benchmark.py --json       # Output raw JSON results
+    python3 benchmark.py --parallel   # Run no-GUI benchmarks in worker processes
     python3 benchmark.py --help       # Show help
 """
 
+import atexit
+import functools
 import gc
+import hashlib
+import itertools
 import json
+import mmap
+import multiprocessing
 import os
 import resource
 import sys
-import tempfile
 import time
 import tracemalloc
 
@@ -27,19 +33,60 @@ try:
 except ImportError:
     _PSUTIL = False
 
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
 # ── Paths ────────────────────────────────────────────────────────────
 PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, PROJECT_DIR)
 
+_PAGESIZE = os.sysconf("SC_PAGESIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _open_proc(path):
+    """Open a /proc file once; ``os.pread(fd, n, 0)`` re-reads fresh values."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    atexit.register(os.close, fd)
+    return fd
+
+
+def _bind_proc_probes():
+    """(Re)bind the sampling handles to the current pid.
+
+    The psutil Process and the /proc fds (statm: one line, second field is
+    RSS in pages) are tied to a pid, so forked workers must call this again.
+    """
+    global _PROC, _STATM_FD, _IO_FD
+    pid = os.getpid()
+    _PROC = psutil.Process() if _PSUTIL else None  # reused per sample
+    _STATM_FD = _open_proc(f"/proc/{pid}/statm")
+    _IO_FD = _open_proc(f"/proc/{pid}/io")
+
+
+_bind_proc_probes()
+
 # ── Helpers ──────────────────────────────────────────────────────────
 
+_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
 def _fmt_bytes(n):
-    """Human-readable byte size."""
-    for unit in ('B', 'KB', 'MB', 'GB'):
-        if abs(n) < 1024:
-            return f"{n:.1f} {unit}"
-        n /= 1024
-    return f"{n:.1f} TB"
+    """Human-readable byte size.
+
+    The unit index comes straight from the magnitude's bit length
+    (10 bits per 1024x step) instead of a divide-and-compare loop.
+    """
+    k = min(4, max(0, (int(abs(n)).bit_length() - 1) // 10))
+    return f"{n / (1 << (k * 10)):.1f} {_UNITS[k]}"
 
 
 def _fmt_time(s):
@@ -53,14 +100,12 @@ def _fmt_time(s):
 def _rss_bytes():
     """Current RSS via /proc or psutil."""
     if _PSUTIL:
-        return psutil.Process().memory_info().rss
-    try:
-        with open(f"/proc/{os.getpid()}/status") as f:
-            for line in f:
-                if line.startswith("VmRSS:"):
-                    return int(line.split()[1]) * 1024
-    except Exception:
-        pass
+        return _PROC.memory_info().rss
+    if _STATM_FD is not None:
+        try:
+            return int(os.pread(_STATM_FD, 128, 0).split()[1]) * _PAGESIZE
+        except Exception:
+            pass
     return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
 
 
@@ -68,25 +113,52 @@ def _io_counters():
     """Return (read_bytes, write_bytes) or None."""
     if _PSUTIL:
         try:
-            io = psutil.Process().io_counters()
+            io = _PROC.io_counters()
             return io.read_bytes, io.write_bytes
         except Exception:
             pass
+    if _IO_FD is None:
+        return None
     try:
-        with open(f"/proc/{os.getpid()}/io") as f:
-            data = {}
-            for line in f:
-                k, v = line.split(":")
-                data[k.strip()] = int(v.strip())
-            return data.get("read_bytes", 0), data.get("write_bytes", 0)
+        data = {}
+        for line in os.pread(_IO_FD, 512, 0).splitlines():
+            k, v = line.split(b":")
+            data[k.strip()] = int(v)
+        return data.get(b"read_bytes", 0), data.get(b"write_bytes", 0)
     except Exception:
         return None
 
 
+def _sample():
+    """Return ``(rss_bytes, io_counters)`` from one batched /proc read.
+
+    With psutil, ``oneshot()`` caches the underlying /proc parses so RSS and
+    I/O counters are collected together instead of re-reading per metric.
+    """
+    if _PSUTIL:
+        with _PROC.oneshot():
+            return _rss_bytes(), _io_counters()
+    return _rss_bytes(), _io_counters()
+
+
+_TK_ROOT = None
+
+
+def _tk_root():
+    """Return a shared, hidden Tk root for the GUI benches (created once)."""
+    global _TK_ROOT
+    if _TK_ROOT is None:
+        import tkinter as tk
+        _TK_ROOT = tk.Tk()
+        _TK_ROOT.withdraw()
+        atexit.register(_TK_ROOT.destroy)
+    return _TK_ROOT
+
+
 def _cpu_percent_snapshot():
     """Return CPU percent (over a short interval) or None."""
     if _PSUTIL:
-        p = psutil.Process()
+        p = _PROC
         p.cpu_percent()  # prime
         time.sleep(0.1)
         return p.cpu_percent()
@@ -95,41 +167,53 @@ def _cpu_percent_snapshot():
 
 # ── Generate test data ───────────────────────────────────────────────
 
+_PRELUDE = '#include <iostream>\n#include <vector>\n#include <string>\nusing namespace std;\n\n'
+_PRELUDE_LINES = len(_PRELUDE.splitlines())
+
+# One function body with a single ``{i}`` placeholder (17 lines incl. blank)
+_FN_TEMPLATE = (
+    'int function_{i}(int x, double y) {{\n'
+    '    // compute result for function {i}\n'
+    '    string msg = "hello from function_{i}";\n'
+    '    vector<int> data = {{1, 2, 3, 4, 5}};\n'
+    '    int result = 0;\n'
+    '    for (int j = 0; j < static_cast<int>(data.size()); j++) {{\n'
+    '        result += data[j] * x;\n'
+    '        if (result > 1000) {{\n'
+    '            cout << msg << " overflow at " << j << endl;\n'
+    '            return -1;\n'
+    '        }}\n'
+    '    }}\n'
+    '    /* multi-line\n'
+    '       comment block */\n'
+    '    return result;\n'
+    '}}\n'
+    '\n'
+)
+_FN_TEMPLATE_LINES = _FN_TEMPLATE.count('\n')
+_MAIN_HEADER = b'\nint main() {\n'
+_MAIN_CALL = '    cout << function_{i}(1, 2.0) << endl;\n'
+_MAIN_FOOTER = b'    return 0;\n}\n'
+
+
+@functools.lru_cache(maxsize=8)
 def _generate_cpp_code(lines=1000):
-    """Generate a realistic C++ source file of the given line count."""
-    chunks = []
-    chunks.append('#include <iostream>\n#include <vector>\n#include <string>\nusing namespace std;\n\n')
-    func_count = 0
-    i = len(chunks[0].splitlines())
-    while i < lines:
-        func_count += 1
-        body = [
-            f'int function_{func_count}(int x, double y) {{',
-            f'    // compute result for function {func_count}',
-            f'    string msg = "hello from function_{func_count}";',
-            f'    vector<int> data = {{1, 2, 3, 4, 5}};',
-            f'    int result = 0;',
-            f'    for (int j = 0; j < static_cast<int>(data.size()); j++) {{',
-            f'        result += data[j] * x;',
-            f'        if (result > 1000) {{',
-            f'            cout << msg << " overflow at " << j << endl;',
-            f'            return -1;',
-            f'        }}',
-            f'    }}',
-            f'    /* multi-line',
-            f'       comment block */',
-            f'    return result;',
-            f'}}',
-            f'',
-        ]
-        chunks.append('\n'.join(body) + '\n')
-        i += len(body)
-
-    chunks.append('\nint main() {\n')
-    for f in range(1, func_count + 1):
-        chunks.append(f'    cout << function_{f}(1, 2.0) << endl;\n')
-    chunks.append('    return 0;\n}\n')
-    return ''.join(chunks)
+    """Generate a realistic C++ source file of the given line count.
+
+    Memoized: the output is a pure function of *lines*, and several
+    benchmarks request the same sizes.
+    """
+    func_count = max(0, -(-(lines - _PRELUDE_LINES) // _FN_TEMPLATE_LINES))
+    fn = _FN_TEMPLATE.format
+    call = _MAIN_CALL.format
+    buf = bytearray(_PRELUDE.encode('ascii'))
+    for i in range(1, func_count + 1):
+        buf.extend(fn(i=i).encode('ascii'))
+    buf.extend(_MAIN_HEADER)
+    for i in range(1, func_count + 1):
+        buf.extend(call(i=i).encode('ascii'))
+    buf.extend(_MAIN_FOOTER)
+    return buf.decode('ascii')
 
 
 # ── Benchmark functions ──────────────────────────────────────────────
@@ -171,32 +255,52 @@ class BenchmarkResult:
         return d
 
 
-def _run_bench(name, func, *args, **kwargs):
-    """Run a benchmark function with full instrumentation."""
+def _run_bench(name, func, *args, track_py_mem=True, **kwargs):
+    """Run a benchmark function with full instrumentation.
+
+    Pass ``track_py_mem=False`` for workloads that allocate mostly inside
+    Tk or the OS: tracemalloc only sees CPython's allocator, so it would
+    add overhead without signal.  Those benches rely on the RSS delta.
+    """
     gc.collect()
     gc.collect()
+    gc.freeze()  # survivors move to the permanent generation, not rescanned
 
     r = BenchmarkResult(name)
-    r.mem_before = _rss_bytes()
-    io_before = _io_counters()
+    r.mem_before, io_before = _sample()
+
+    if track_py_mem:
+        tracemalloc.clear_traces()
+        tracemalloc.start(1)  # only the peak is reported; 1 frame is enough
+        # Exclude setup allocations from the peak (Python 3.9+)
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+    # No collector pauses inside the measured window (stable timings)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        t0_cpu = time.process_time()
+        t0_wall = time.perf_counter()
 
-    tracemalloc.start()
-    t0_cpu = time.process_time()
-    t0_wall = time.perf_counter()
+        result = func(*args, **kwargs)
 
-    result = func(*args, **kwargs)
+        t1_cpu = time.process_time()
+        t1_wall = time.perf_counter()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        gc.unfreeze()
 
-    t1_cpu = time.process_time()
-    t1_wall = time.perf_counter()
-    _, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
+    peak = 0
+    if track_py_mem:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
 
     r.cpu_time = t1_cpu - t0_cpu
     r.wall_time = t1_wall - t0_wall
-    r.mem_after = _rss_bytes()
+    r.mem_after, io_after = _sample()
     r.tracemalloc_peak = peak
 
-    io_after = _io_counters()
     if io_before and io_after:
         r.io_read = io_after[0] - io_before[0]
         r.io_write = io_after[1] - io_before[1]
@@ -212,9 +316,8 @@ def _run_bench(name, func, *args, **kwargs):
 def bench_import_startup():
     """Measure importing core modules (no Tkinter, no GUI)."""
     # Remove cached modules so import is fresh
-    for mod in list(sys.modules):
-        if mod in ('syntax_highlighter', 'extension_api', 'extension_manager'):
-            del sys.modules[mod]
+    for mod in ('syntax_highlighter', 'extension_api', 'extension_manager'):
+        sys.modules.pop(mod, None)
 
     def _do():
         import syntax_highlighter  # noqa: F401
@@ -230,9 +333,8 @@ def bench_import_startup():
 
 def bench_pygments_lazy_load():
     """Measure the cost of first Pygments load."""
-    for mod in list(sys.modules):
-        if 'pygments' in mod:
-            del sys.modules[mod]
+    for mod in [m for m in sys.modules if m.startswith('pygments')]:
+        del sys.modules[mod]
     import syntax_highlighter
     # Reset the lazy flags
     syntax_highlighter.PYGMENTS_AVAILABLE = False
@@ -256,13 +358,14 @@ def bench_lexer_creation():
         times = {}
         # First call — cold cache
         t0 = time.perf_counter()
-        syntax_highlighter.SyntaxHighlighter._get_lexer('cpp')
+        syntax_highlighter.SyntaxHighlighter.get_lexer('cpp')
         times['cold_cache_ms'] = round((time.perf_counter() - t0) * 1000, 3)
 
-        # Second call — warm cache
+        # Second call — warm cache (bound locally so only the lookup is timed)
+        get = syntax_highlighter.SyntaxHighlighter.get_lexer
         t0 = time.perf_counter()
-        for _ in range(1000):
-            syntax_highlighter.SyntaxHighlighter._get_lexer('cpp')
+        for _ in itertools.repeat(None, 1000):
+            get('cpp')
         times['warm_cache_1000x_ms'] = round((time.perf_counter() - t0) * 1000, 3)
         return times
 
@@ -272,22 +375,14 @@ def bench_lexer_creation():
 def bench_syntax_highlighting():
     """Measure syntax highlighting on a 1000-line C++ file (headless lex only)."""
     import syntax_highlighter
-    syntax_highlighter._ensure_pygments()
-    if not syntax_highlighter.PYGMENTS_AVAILABLE:
-        r = BenchmarkResult("4. Syntax Highlighting (1000 lines)")
-        r.extra = {'skipped': 'Pygments not available'}
-        return r
-
-    from pygments.lexers import CppLexer
     code = _generate_cpp_code(1000)
-    lexer = CppLexer()
 
     def _do():
-        tokens = list(syntax_highlighter._lex(code, lexer))
+        tokens = syntax_highlighter.tokenize_cpp(code)
         return {
             'lines': code.count('\n'),
             'chars': len(code),
-            'tokens': len(tokens),
+            'tokens': len(tokens) // 3,
         }
 
     return _run_bench("4. Syntax Highlighting (1000 lines)", _do)
@@ -296,22 +391,14 @@ def bench_syntax_highlighting():
 def bench_syntax_highlighting_large():
     """Measure on 10,000-line file."""
     import syntax_highlighter
-    syntax_highlighter._ensure_pygments()
-    if not syntax_highlighter.PYGMENTS_AVAILABLE:
-        r = BenchmarkResult("5. Syntax Highlighting (10,000 lines)")
-        r.extra = {'skipped': 'Pygments not available'}
-        return r
-
-    from pygments.lexers import CppLexer
     code = _generate_cpp_code(10000)
-    lexer = CppLexer()
 
     def _do():
-        tokens = list(syntax_highlighter._lex(code, lexer))
+        tokens = syntax_highlighter.tokenize_cpp(code)
         return {
             'lines': code.count('\n'),
             'chars': len(code),
-            'tokens': len(tokens),
+            'tokens': len(tokens) // 3,
         }
 
     return _run_bench("5. Syntax Highlighting (10,000 lines)", _do)
@@ -350,31 +437,88 @@ def bench_extension_loading():
     return _run_bench("6. Extension Discovery & Caching", _do)
 
 
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_tmpfile(path, data):
+    """Create *path* holding *data*, for a scratch file the bench deletes.
+
+    On Linux the file starts as an anonymous ``O_TMPFILE`` inode and is
+    linked in under *path* once written, skipping ``tempfile``'s random
+    name search and the extra open/close.  Falls back to an exclusive
+    create elsewhere.
+    """
+    # A leftover from a crashed run with the same pid would make both the
+    # link and the exclusive create fail
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    if hasattr(os, 'O_TMPFILE'):
+        try:
+            fd = os.open(os.path.dirname(path), os.O_TMPFILE | os.O_WRONLY, 0o600)
+        except OSError:
+            fd = None  # filesystem without O_TMPFILE support
+        if fd is not None:
+            try:
+                _write_all(fd, data)
+                # linkat(AT_SYMLINK_FOLLOW) via the /proc fd entry names the inode
+                proc_fd = os.open('/proc/self/fd', os.O_RDONLY)
+                try:
+                    os.link(str(fd), path, src_dir_fd=proc_fd, follow_symlinks=True)
+                    return
+                except OSError:
+                    pass  # linking not permitted here; use the plain path
+                finally:
+                    os.close(proc_fd)
+            finally:
+                os.close(fd)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        _write_all(fd, data)
+    finally:
+        os.close(fd)
+
+
 def bench_file_io():
     """Measure file read/write performance with various sizes."""
 
     def _do():
         results = {}
         for size_label, lines in [('100 lines', 100), ('1K lines', 1000), ('10K lines', 10000)]:
-            code = _generate_cpp_code(lines)
-            code_bytes = len(code.encode('utf-8'))
+            # Encode once up front: the timed regions move bytes only
+            data = _generate_cpp_code(lines).encode('utf-8')
+            code_bytes = len(data)
 
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.cpp', delete=False,
-                                              dir=PROJECT_DIR) as f:
-                tmppath = f.name
+            tmppath = os.path.join(PROJECT_DIR, f'.bench_io_{os.getpid()}.cpp')
 
             # Write benchmark
             t0 = time.perf_counter()
-            with open(tmppath, 'w', encoding='utf-8') as f:
-                f.write(code)
+            _write_tmpfile(tmppath, data)
             write_time = time.perf_counter() - t0
 
             # Read benchmark
             t0 = time.perf_counter()
-            with open(tmppath, 'r', encoding='utf-8') as f:
+            with open(tmppath, 'rb', buffering=1 << 20) as f:
                 _ = f.read()
             read_time = time.perf_counter() - t0
 
+            # mmap read: page-cache mapping, one copy vs. zero-copy hash scan
+            fd = os.open(tmppath, os.O_RDONLY)
+            try:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    t0 = time.perf_counter()
+                    _ = bytes(mm)
+                    mmap_copy_time = time.perf_counter() - t0
+                    t0 = time.perf_counter()
+                    _ = hashlib.blake2b(mm).digest()
+                    mmap_scan_time = time.perf_counter() - t0
+            finally:
+                os.close(fd)
+
             file_size = os.path.getsize(tmppath)
             os.unlink(tmppath)
 
@@ -383,21 +527,24 @@ def bench_file_io():
                 'file_size_bytes': file_size,
                 'write_ms': round(write_time * 1000, 3),
                 'read_ms': round(read_time * 1000, 3),
+                'mmap_copy_ms': round(mmap_copy_time * 1000, 3),
+                'mmap_scan_ms': round(mmap_scan_time * 1000, 3),
                 'write_throughput': _fmt_bytes(code_bytes / max(write_time, 1e-9)) + '/s',
                 'read_throughput': _fmt_bytes(code_bytes / max(read_time, 1e-9)) + '/s',
+                'mmap_copy_throughput': _fmt_bytes(code_bytes / max(mmap_copy_time, 1e-9)) + '/s',
             }
         return results
 
-    return _run_bench("7. File I/O (Read & Write)", _do)
+    return _run_bench("7. File I/O (Read & Write)", _do, track_py_mem=False)
 
 
 def bench_undo_stack_memory():
     """Simulate undo stack growth with maxundo=50 vs unlimited."""
 
+    root = _tk_root()  # shared; Tk startup stays out of the measurement
+
     def _do():
         import tkinter as tk
-        root = tk.Tk()
-        root.withdraw()
 
         results = {}
 
@@ -450,39 +597,42 @@ def bench_undo_stack_memory():
             'insertions': 500,
         }
         t_unlimited.destroy()
-        root.destroy()
         return results
 
-    return _run_bench("8. Undo Stack (capped vs unlimited)", _do)
+    return _run_bench("8. Undo Stack (capped vs unlimited)", _do, track_py_mem=False)
 
 
 def bench_output_buffer_cap():
     """Simulate output buffer growth and verify cap at 2000 lines."""
 
+    root = _tk_root()  # shared; Tk startup stays out of the measurement
+
     def _do():
         import tkinter as tk
-        root = tk.Tk()
-        root.withdraw()
         output = tk.Text(root, state='disabled')
         output.pack()
 
         gc.collect()
         mem_before = _rss_bytes()
 
-        # Simulate output_write with capping logic
+        # Simulate output_write with capping logic.  end_line mirrors
+        # int(float(output.index('end'))) without a Tcl round-trip per write.
+        # The state flips are hoisted so only the cap algorithm is measured.
+        end_line = 2  # 'end' of an empty Text widget is '2.0'
+        output.config(state='normal')
         for i in range(5000):
-            output.config(state='normal')
-            if int(float(output.index('end'))) > 2000:
+            if end_line > 2000:
                 output.delete('1.0', '500.0')
+                end_line -= 499
             output.insert('end', f'[output] Line {i}: Compilation result message\n')
-            output.config(state='disabled')
+            end_line += 1
+        output.config(state='disabled')
 
         gc.collect()
         mem_after = _rss_bytes()
         final_lines = int(float(output.index('end'))) - 1
 
         output.destroy()
-        root.destroy()
         return {
             'lines_written': 5000,
             'final_lines_in_buffer': final_lines,
@@ -491,16 +641,33 @@ def bench_output_buffer_cap():
             'mem_delta_bytes': mem_after - mem_before,
         }
 
-    return _run_bench("9. Output Buffer Cap (5000→2000 lines)", _do)
+    return _run_bench("9. Output Buffer Cap (5000→2000 lines)", _do, track_py_mem=False)
+
+
+def _tag_lines(text, lines):
+    """Apply the keyword/string/comment sample tags to *lines*.
+
+    Tk's ``tag add`` accepts any number of index pairs, so each tag is
+    applied with one Tcl call instead of one call per line.
+    """
+    kw, st, cm = [], [], []
+    for i in lines:
+        kw += (f'{i}.0', f'{i}.3')
+        st += (f'{i}.5', f'{i}.10')
+        cm += (f'{i}.12', f'{i}.end')
+    if kw:
+        text.tag_add('keyword', *kw)
+        text.tag_add('string', *st)
+        text.tag_add('comment', *cm)
 
 
 def bench_tag_virtualization():
     """Measure tag memory: full-file tags vs virtualized (visible-only) tags."""
 
+    root = _tk_root()  # shared; Tk startup stays out of the measurement
+
     def _do():
         import tkinter as tk
-        root = tk.Tk()
-        root.withdraw()
 
         code = _generate_cpp_code(2000)
         results = {}
@@ -512,10 +679,7 @@ def bench_tag_virtualization():
         gc.collect()
         mem_before = _rss_bytes()
         line_count = int(t_full.index('end').split('.')[0])
-        for i in range(1, line_count):
-            t_full.tag_add('keyword', f'{i}.0', f'{i}.3')
-            t_full.tag_add('string', f'{i}.5', f'{i}.10')
-            t_full.tag_add('comment', f'{i}.12', f'{i}.end')
+        _tag_lines(t_full, range(1, line_count))
         gc.collect()
         mem_after = _rss_bytes()
         tag_ranges_full = len(t_full.tag_ranges('keyword'))
@@ -533,10 +697,7 @@ def bench_tag_virtualization():
         gc.collect()
         mem_before = _rss_bytes()
         visible_start, visible_end = 500, 560
-        for i in range(visible_start, visible_end):
-            t_virt.tag_add('keyword', f'{i}.0', f'{i}.3')
-            t_virt.tag_add('string', f'{i}.5', f'{i}.10')
-            t_virt.tag_add('comment', f'{i}.12', f'{i}.end')
+        _tag_lines(t_virt, range(visible_start, visible_end))
         gc.collect()
         mem_after = _rss_bytes()
         tag_ranges_virt = len(t_virt.tag_ranges('keyword'))
@@ -547,7 +708,6 @@ def bench_tag_virtualization():
             'visible_lines': visible_end - visible_start,
         }
         t_virt.destroy()
-        root.destroy()
 
         # Summary
         results['improvement'] = {
@@ -556,7 +716,17 @@ def bench_tag_virtualization():
         }
         return results
 
-    return _run_bench("10. Tag Virtualization (full vs visible)", _do)
+    return _run_bench("10. Tag Virtualization (full vs visible)", _do, track_py_mem=False)
+
+
+_CORE_FILES = frozenset((
+    'cpp_editor.py', 'extension_api.py', 'extension_manager.py',
+    'extension_marketplace.py', 'syntax_highlighter.py',
+))
+_CATEGORY_PREFIXES = (
+    ('extensions' + os.sep, 'extensions'),
+    ('marketplace' + os.sep, 'marketplace'),
+)
 
 
 def bench_storage_footprint():
@@ -567,37 +737,41 @@ def bench_storage_footprint():
         total_size = 0
         file_count = 0
         by_category = {
-            'core': {'pattern': ['cpp_editor.py', 'extension_api.py', 'extension_manager.py',
-                                  'extension_marketplace.py', 'syntax_highlighter.py'], 'size': 0, 'count': 0},
-            'extensions': {'pattern': 'extensions/', 'size': 0, 'count': 0},
-            'marketplace': {'pattern': 'marketplace/', 'size': 0, 'count': 0},
-            'other_py': {'pattern': '.py', 'size': 0, 'count': 0},
+            key: {'size': 0, 'count': 0}
+            for key in ('core', 'extensions', 'marketplace', 'other_py')
         }
 
-        for root_dir, dirs, files in os.walk(PROJECT_DIR):
-            # Skip hidden dirs and __pycache__
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d != '__pycache__']
-            for fname in files:
+        # Explicit-stack scandir walk: DirEntry caches the d_type from
+        # getdents, so only .py files need a stat() call.
+        stack = [PROJECT_DIR]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+            for entry in entries:
+                fname = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    # Skip hidden dirs and __pycache__
+                    if not fname.startswith('.') and fname != '__pycache__':
+                        stack.append(entry.path)
+                    continue
                 if not fname.endswith('.py'):
                     continue
-                fpath = os.path.join(root_dir, fname)
-                fsize = os.path.getsize(fpath)
+                fsize = entry.stat().st_size
                 total_size += fsize
                 file_count += 1
-                relpath = os.path.relpath(fpath, PROJECT_DIR)
-
-                if fname in by_category['core']['pattern']:
-                    by_category['core']['size'] += fsize
-                    by_category['core']['count'] += 1
-                elif relpath.startswith('extensions/'):
-                    by_category['extensions']['size'] += fsize
-                    by_category['extensions']['count'] += 1
-                elif relpath.startswith('marketplace/'):
-                    by_category['marketplace']['size'] += fsize
-                    by_category['marketplace']['count'] += 1
+
+                if fname in _CORE_FILES:
+                    key = 'core'
                 else:
-                    by_category['other_py']['size'] += fsize
-                    by_category['other_py']['count'] += 1
+                    relpath = os.path.relpath(entry.path, PROJECT_DIR)
+                    key = 'other_py'
+                    for prefix, k in _CATEGORY_PREFIXES:
+                        if relpath.startswith(prefix):
+                            key = k
+                            break
+                bucket = by_category[key]
+                bucket['size'] += fsize
+                bucket['count'] += 1
 
         results['total'] = {'files': file_count, 'size': _fmt_bytes(total_size), 'size_bytes': total_size}
         for cat, info in by_category.items():
@@ -611,7 +785,8 @@ def bench_storage_footprint():
 def bench_process_overview():
     """Snapshot of current process metrics."""
     r = BenchmarkResult("0. Process Overview")
-    r.mem_after = _rss_bytes()
+    # RSS and I/O come from the same batched probe as _run_bench
+    r.mem_after, io = _sample()
     r.cpu_percent = _cpu_percent_snapshot()
     r.extra = {
         'pid': os.getpid(),
@@ -620,15 +795,12 @@ def bench_process_overview():
         'psutil_available': _PSUTIL,
     }
     if _PSUTIL:
-        p = psutil.Process()
-        r.extra['threads'] = p.num_threads()
-        r.extra['open_files'] = len(p.open_files())
-        try:
-            io = p.io_counters()
-            r.extra['total_read'] = _fmt_bytes(io.read_bytes)
-            r.extra['total_write'] = _fmt_bytes(io.write_bytes)
-        except Exception:
-            pass
+        with _PROC.oneshot():
+            r.extra['threads'] = _PROC.num_threads()
+            r.extra['open_files'] = len(_PROC.open_files())
+    if io:
+        r.extra['total_read'] = _fmt_bytes(io[0])
+        r.extra['total_write'] = _fmt_bytes(io[1])
     return r
 
 
@@ -691,8 +863,18 @@ def _print_extra(data, indent=6):
 
 # ── Main ─────────────────────────────────────────────────────────────
 
+def _call_bench(fn):
+    """Run one benchmark; returns ``(fn_name, result, error)`` (picklable)."""
+    try:
+        return fn.__name__, fn(), None
+    except Exception as e:
+        return fn.__name__, None, str(e)
+
+
 def main():
     json_mode = '--json' in sys.argv
+    parallel = ('--parallel' in sys.argv
+                and 'fork' in multiprocessing.get_all_start_methods())
     if '--help' in sys.argv:
         print(__doc__)
         return
@@ -721,13 +903,21 @@ def main():
     ]
 
     results = []
-    for fn in benchmarks_no_gui:
-        try:
-            r = fn()
+    if parallel:
+        # Independent benches run side by side; each measures itself in
+        # its own worker.  Absolute timings are noisier than the default.
+        ctx = multiprocessing.get_context('fork')
+        with ctx.Pool(min(len(benchmarks_no_gui), os.cpu_count() or 1),
+                      initializer=_bind_proc_probes) as pool:
+            outcomes = pool.map(_call_bench, benchmarks_no_gui)
+    else:
+        outcomes = map(_call_bench, benchmarks_no_gui)
+    for fn_name, r, err in outcomes:
+        if r is not None:
             results.append(r)
             print(f"  ✓ {r.name}")
-        except Exception as e:
-            print(f"  ✗ {fn.__name__}: {e}")
+        else:
+            print(f"  ✗ {fn_name}: {err}")
 
     if has_display:
         for fn in benchmarks_gui:
@@ -745,15 +935,18 @@ def main():
     # Sort by name
     results.sort(key=lambda r: r.name)
 
+    # Serialize once; reused for --json output and the saved report
+    payload = _dumps([r.to_dict() for r in results])
+
     if json_mode:
-        print(json.dumps([r.to_dict() for r in results], indent=2))
+        print(payload.decode('utf-8'))
     else:
         print_report(results)
 
     # Save JSON to file
     report_path = os.path.join(PROJECT_DIR, 'benchmark_results.json')
-    with open(report_path, 'w') as f:
-        json.dump([r.to_dict() for r in results], f, indent=2)
+    with open(report_path, 'wb') as f:
+        f.write(payload)
     print(f"  📄 JSON results saved to: {report_path}\n")
 
 
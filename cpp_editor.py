@@ -2,10 +2,18 @@ import sys
 sys.dont_write_bytecode = True  # suppress __pycache__ writes (reduce SSD wear)
 
 import atexit
+import codecs
+import collections
+import functools
+import itertools
+import hashlib
+import io
 import json
 import logging
+import mmap
 import os
 import re
+import shutil
 import signal
 from pathlib import Path
 from typing import Optional
@@ -15,7 +23,9 @@ import tempfile
 import threading
 import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog, messagebox
+from tkinter import font as tkfont
 from tkinter import ttk
 
 from extension_manager import ExtensionManager
@@ -26,6 +36,191 @@ log = logging.getLogger("scc.editor")
 # Persisted window geometry
 _CONFIG_FILE = Path.home() / ".scc_editor.json"
 
+# Files above this size are mapped and fed to the Text widget in chunks
+# instead of being read into one Python str first.
+_MMAP_THRESHOLD = 256 * 1024
+_READ_CHUNK = 64 * 1024
+# set_text inserts this many characters per idle callback
+_INSERT_CHUNK = 16 * 1024
+# save_file reads the buffer back this many lines at a time
+_SAVE_CHUNK_LINES = 1024
+
+# Highlight/line-number refresh debounce (ms); buffers longer than
+# _LARGE_FILE_LINES use the longer delay
+_DEBOUNCE_MS = 100
+_DEBOUNCE_LARGE_MS = 300
+_LARGE_FILE_LINES = 2000
+# "No edited line" marker for the fallback highlighter's dirty tracking
+_CLEAN = sys.maxsize
+
+# _build_cache key for builds of the unsaved buffer (compiled from stdin)
+_BUFFER_KEY = '<buffer>'
+
+# Pause after the last edit before the background g++ -fsyntax-only pass
+_SYNTAX_CHECK_MS = 600
+
+# Wall-clock limit for a running program, in seconds
+_RUN_TIMEOUT = 20
+
+# g++ diagnostics: file.cpp:line:col: error|warning: message
+_GCC_DIAG_RE = re.compile(r'(?P<file>[^:\s]+):(\s?)(?P<line>\d+):(\d+):\s(?P<kind>error|warning):\s(?P<msg>.*)')
+
+# Console output is flushed from a queue every _OUTPUT_FLUSH_MS while it
+# is flowing (~60 Hz) and polled every _OUTPUT_IDLE_MS otherwise; once it
+# grows past _OUTPUT_MAX_LINES the oldest lines are trimmed so that
+# _OUTPUT_KEEP_LINES remain.
+_OUTPUT_FLUSH_MS = 16
+_OUTPUT_IDLE_MS = 50
+_OUTPUT_MAX_LINES = 2000
+_OUTPUT_KEEP_LINES = 1500
+
+# Fallback (no Pygments) highlighter.  Comments and strings are located with
+# str.find (C-speed scans, no regex backtracking); the keyword/type
+# alternation only runs over the code between them.
+# One shared word boundary on each side, so non-boundary positions are
+# rejected before either alternative is tried.
+_WORD_RE = re.compile(
+    r'\b(?:(?P<keyword>if|else|for|while|return|break|continue|goto|switch|case|default|namespace|using|class|struct|template|typename|public|private|protected|virtual|override|constexpr)'
+    r'|(?P<type>int|long|short|float|double|char|void|bool|unsigned|signed|size_t|auto))\b'
+)
+_STRING_RE = re.compile(r'"(?:[^"\\\n]|\\.)*"?|\'(?:[^\'\\\n]|\\.)*\'?')
+_DELIMITERS = ('//', '/*', '"', "'")
+
+
+def _write_and_close(stream, data):
+    try:
+        with stream:
+            stream.write(data)
+    except OSError:
+        pass  # compiler exited early; its stderr says why
+
+
+def _quote_dir(path):
+    """Directory g++ should search for ``#include "..."`` in *path*.
+
+    Sources piped to stdin have no directory of their own, so builds and
+    syntax checks of the buffer pass this with ``-iquote``.
+    """
+    return os.path.dirname(os.path.abspath(path)) if path else os.getcwd()
+
+
+def _line_directive(path):
+    """``#line`` prefix that keeps __FILE__ and diagnostics naming *path*."""
+    return '#line 1 "%s"\n' % path.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _source_digest(path):
+    """Hash the bytes of *path* to detect unchanged sources between builds."""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).digest()
+
+
+def _fallback_spans(text, pos=0):
+    """Yield ``(tag, start, end)`` offsets for the fallback highlighter."""
+    find = text.find
+    n = len(text)
+    nxt = dict.fromkeys(_DELIMITERS, -2)  # cached next occurrence (-1: none)
+    while pos < n:
+        # Earliest comment/string opener at or after pos
+        best, which = n, None
+        for d in _DELIMITERS:
+            i = nxt[d]
+            if i == -2 or 0 <= i < pos:  # unknown or already passed
+                i = nxt[d] = find(d, pos)
+            if i != -1 and i < best:
+                best, which = i, d
+        for m in _WORD_RE.finditer(text, pos, best):
+            yield m.lastgroup, m.start(), m.end()
+        if which is None:
+            return
+        if which == '//':
+            end = find('\n', best)
+            tag, end = 'comment', (n if end == -1 else end)
+        elif which == '/*':
+            end = find('*/', best + 2)
+            tag, end = 'comment', (n if end == -1 else end + 2)
+        else:
+            tag, end = 'string', _STRING_RE.match(text, best).end()
+        yield tag, best, end
+        pos = end
+
+
+@functools.lru_cache(maxsize=4096)
+def _line_spans(line, in_block):
+    """Spans for one line, given whether it starts inside a ``/* */`` block.
+
+    Returns ``(spans, in_block_at_end)``.  Memoized on the line text and
+    entry state, so unchanged lines are never rescanned.
+    """
+    spans = []
+    pos = 0
+    if in_block:
+        end = line.find('*/')
+        if end == -1:
+            return ((('comment', 0, len(line)),) if line else ()), True
+        pos = end + 2
+        spans.append(('comment', 0, pos))
+    spans.extend(_fallback_spans(line, pos))
+    if spans:
+        tag, s, e = spans[-1]
+        # An unterminated '/*' runs to the end of the line and beyond
+        in_block = (tag == 'comment' and s >= pos and line.startswith('/*', s)
+                    and (e - s < 4 or not line.endswith('*/', s, e)))
+    return tuple(spans), in_block
+
+
+class LineNumberGutter(tk.Canvas):
+    """Canvas gutter that draws numbers for the visible lines of a Text.
+
+    Only lines on screen are drawn, as one text item, so a redraw costs a
+    handful of Tk calls no matter how long the file is.  ``fg`` is
+    accepted by ``config`` like on a Text gutter and recolours the numbers.
+    """
+
+    def __init__(self, master, text, fg='gray', font=None, **kw):
+        super().__init__(master, highlightthickness=0, **kw)
+        self._text = text
+        self._fg = fg
+        self._font = tkfont.Font(font=font or text.cget('font'))
+        self._digits = 0
+        self._drawn = None  # (last line, top line, top y, height) last drawn
+
+    def configure(self, cnf=None, **kw):
+        if 'fg' in kw:
+            self._fg = kw.pop('fg')
+            self.itemconfigure('lineno', fill=self._fg)
+            if not kw and not cnf:
+                return None
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def redraw(self):
+        text = self._text
+        res = text.count('1.0', 'end-1c', 'lines')
+        last = (res[0] if res else 0) + 1
+        digits = len(str(last))
+        if digits != self._digits:
+            # Resize only when the count crosses a power of ten
+            self._digits = digits
+            super().configure(width=self._font.measure('0' * digits) + 8)
+        line = int(text.index('@0,0').split('.')[0])
+        top = text.dlineinfo(f'{line}.0')
+        # Same line count and same scroll position: numbers are already right
+        key = (last, line, top and top[1], self.winfo_height())
+        if key == self._drawn:
+            return
+        self._drawn = key
+        self.delete('lineno')
+        if top is None:
+            return
+        # wrap='none' and one font give uniform line heights, so every
+        # visible number fits in a single multi-line text item
+        bottom = int(text.index(f'@0,{text.winfo_height()}').split('.')[0])
+        nums = '\n'.join(map(str, range(line, min(bottom, last) + 1)))
+        self.create_text(int(self.cget('width')) - 4, top[1], anchor='ne', justify='right',
+                         text=nums, fill=self._fg, font=self._font, tags='lineno')
+
 
 class CppEditorApp:
     def __init__(self, root):
@@ -38,14 +233,48 @@ class CppEditorApp:
         self._build_ui()
         self._bind_events()
 
-        # Initialize highlight_timer before calling update_highlight in set_text
-        self.highlight_timer = None
-        self._last_line_count = 0  # for incremental line-number updates
+        # Initialize _refresh_timer before calling update_highlight in set_text
+        self._refresh_timer = None
+        self._refresh_delay = _DEBOUNCE_MS
+        # Fallback highlighter: viewport last tagged and first line edited
+        # since (_CLEAN: none)
+        self._tagged_view = None
+        self._dirty_from = _CLEAN
+        self._key_line = _CLEAN
+        self._key_edit = False  # between a key press and its release
+        self._last_key_time = 0.0  # time.monotonic() of the last key press
         self._cached_lang = None   # cached language for highlighter
+        self._cached_lexer = None  # lexer resolved for _cached_lang
+        # chunked loading: pending chunk iterator and its after_idle id
+        self._feed = None
+        self._feed_job = None
+        self._feed_path = None  # file being opened, set current once loaded
         # process management
         self.current_process: Optional[subprocess.Popen] = None
+        # Long-lived workers for compile/run jobs (no thread spawn per click)
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='scc-build')
+        # Single worker for Pygments lexing; results older than _hl_gen are
+        # dropped when they come back
+        self._lex_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scc-lex')
+        self._hl_gen = 0
+        # Futures not yet finished on either pool, cancelled on close
+        # (shutdown's cancel_futures needs Python 3.9)
+        self._pending = set()
+        # -fsyntax-only diagnostics, run after typing pauses
+        self._syntax_timer = None
+        self._syntax_gen = 0
+        self._syntax_source = None  # last text handed to the checker
+        self._gxx_available = True
+        # path -> (source digest, exe mtime, exe) of the last successful build
+        self._build_cache = {}
+        self._build_ids = itertools.count()  # names stdin build outputs
+        self._scratch = None  # temp dir for stdin builds, removed on close
+        # console output queue; None entries mean "clear the console"
+        self._out_queue = collections.deque()
+        self._pump_output()
         # track if editor buffer is modified (unsaved changes)
         self.dirty = False
+        self._text_cache = None  # get_text() snapshot, None once edited
         self.set_text(self.default_cpp())
         self.update_highlight()
 
@@ -57,7 +286,11 @@ class CppEditorApp:
             self.ext_manager = None  # editor works without extensions
 
         # ── Restore saved window geometry ────────────────────────────────
-        self._restore_geometry()
+        # Deferred until the window is mapped and its first redraw has run,
+        # so reading the config file never delays the first paint (a saved
+        # size is applied just after the window first shows)
+        self._geometry_saved = False
+        self._map_bind = self.root.bind('<Map>', self._on_first_map, add='+')
 
         log.info("Editor ready.")
 
@@ -90,12 +323,14 @@ class CppEditorApp:
         top_frame = tk.Frame(self.root)
         top_frame.pack(fill='both', expand=True)
 
-        self.line_numbers = tk.Text(top_frame, width=5, padx=3, takefocus=0, bd=0, bg='#f0f0f0', fg='gray', state='disabled')
-        self.line_numbers.pack(side='left', fill='y')
-
         self.text = tk.Text(top_frame, wrap='none', undo=True, maxundo=50,
                            autoseparators=False, font=('Consolas', 12))
+        self.line_numbers = LineNumberGutter(top_frame, self.text, takefocus=0, bd=0,
+                                             bg='#f0f0f0', fg='gray')
+        self.line_numbers.pack(side='left', fill='y')
         self.text.pack(side='left', fill='both', expand=True)
+        # The view moved (scroll, edit, resize): redraw the visible numbers
+        self.text.configure(yscrollcommand=lambda *a: self.update_line_numbers())
 
         xscroll = tk.Scrollbar(self.root, orient='horizontal', command=self.text.xview)
         xscroll.pack(fill='x')
@@ -133,42 +368,77 @@ class CppEditorApp:
         # Syntax highlight tags (base config)
         self.text.tag_configure('error_line', background='#420000')
 
-        # Try to use external SyntaxHighlighter (lazy Pygments loading)
+        # The Pygments-based highlighter is created after the first paint
+        # (see _init_highlighter); until then the regex fallback is used.
+        self.highlighter = None
+        self.text.tag_configure('keyword', foreground='blue')
+        self.text.tag_configure('type', foreground='#1c9d00')
+        self.text.tag_configure('string', foreground='#d14')
+        self.text.tag_configure('comment', foreground='#888')
+        self.root.after(50, self._init_highlighter)
+
+    def _init_highlighter(self):
+        """Import Pygments off the startup path and switch highlighters."""
         try:
-            from syntax_highlighter import SyntaxHighlighter, PYGMENTS_AVAILABLE
-            self.highlighter = SyntaxHighlighter(self.text)
-            if PYGMENTS_AVAILABLE:
-                self.highlighter.create_tags()
-            else:
-                self.highlighter = None
+            import syntax_highlighter as sh
+            highlighter = sh.SyntaxHighlighter(self.text)
         except Exception:
-            self.highlighter = None
-        # Basic tags fallback if no Pygments-based highlighter
-        if not self.highlighter:
-            self.text.tag_configure('keyword', foreground='blue')
-            self.text.tag_configure('type', foreground='#1c9d00')
-            self.text.tag_configure('string', foreground='#d14')
-            self.text.tag_configure('comment', foreground='#888')
+            return
+        # Read the flag off the module: the constructor's lazy import is
+        # what sets it, so a from-import would copy the initial False
+        if not sh.PYGMENTS_AVAILABLE:
+            return
+        highlighter.create_tags()
+        self.highlighter = highlighter
+        self.update_highlight()
 
     def _bind_events(self):
+        # Key releases only mark dirty and (re)schedule one coalesced refresh
+        # job that updates both highlighting and line numbers
         self.text.bind('<KeyRelease>', self._on_key_release)
-        self.text.bind('<Button-1>', lambda e: self.update_line_numbers())
+        # Key presses (including auto-repeat of a held key) defer the refresh
+        self.text.bind('<KeyPress>', self._on_key_press, add='+')
+        # A key that opens a dialog or grab (Ctrl+O, a messagebox) never
+        # delivers its release here; losing focus ends the key edit instead
+        self.text.bind('<FocusOut>', self._on_focus_out, add='+')
         # Scroll events trigger highlight for virtualized tags + line numbers
         self.text.bind('<MouseWheel>', lambda e: self.update_highlight())
         self.text.bind('<Button-4>', lambda e: self.update_highlight())
         self.text.bind('<Button-5>', lambda e: self.update_highlight())
-        self.text.bind('<Return>', lambda e: self.update_line_numbers())
+        # Resizing exposes new lines that need (visible-region) highlighting
+        self.text.bind('<Configure>', lambda e: self.update_highlight())
         self.lang_combo.bind('<<ComboboxSelected>>', lambda e: self.update_highlight())
+        # Any content change (typing, paste, undo, programmatic) drops the
+        # get_text() snapshot
+        self.text.bind('<<Modified>>', self._on_modified)
         # Bind close event to check for unsaved changes
         self.root.protocol('WM_DELETE_WINDOW', self.on_close)
 
+    def _on_key_press(self, event):
+        self._last_key_time = time.monotonic()
+        self._key_line = self._insert_line()
+        self._key_edit = True
+
+    def _on_focus_out(self, event):
+        self._key_edit = False
+
     def _on_key_release(self, event):
-        self.set_dirty(True)
+        # Edits land between the insert line at press and at release (a
+        # deleted selection collapses to its start), so nothing above the
+        # lower of the two changed
+        self._key_edit = False
+        self._dirty_from = min(self._dirty_from, self._key_line, self._insert_line())
+        self._hl_gen += 1  # any in-flight lexer result now has stale offsets
+        self._syntax_gen += 1  # ...and so does an in-flight syntax check
         self.update_highlight()
+        self._schedule_syntax_check()
         # dispatch to extensions
         if hasattr(self, 'ext_manager') and self.ext_manager:
             self.ext_manager.dispatch_key(event)
 
+    def _insert_line(self):
+        return int(self.text.index('insert').split('.')[0])
+
     def default_cpp(self):
         return r"""#include <iostream>
 using namespace std;
@@ -179,6 +449,21 @@ int main() {
 }
 """
 
+    @property
+    def current_file(self):
+        return self._current_file
+
+    @current_file.setter
+    def current_file(self, path):
+        # Derived names are needed on every build/run/save; split the path
+        # once here instead of on each of those calls
+        self._current_file = path
+        if path is None:
+            self._current_basename = self._current_exe = None
+        else:
+            self._current_basename = os.path.basename(path)
+            self._current_exe = os.path.splitext(path)[0]  # no .exe on Linux
+
     def new_file(self):
         if not self.confirm_discard():
             return
@@ -201,78 +486,202 @@ int main() {
 
     def set_dirty(self, v: bool):
         self.dirty = v
-        # also set Tk edit modified flag for compatibility
-        try:
-            self.text.edit_modified(bool(v))
-        except Exception:
-            pass
+        if not v:
+            # <<Modified>> is queued, so a change notice can still be pending
+            # (e.g. the delete in new_file).  Clearing Tk's flag makes
+            # _on_modified ignore it; drop the text snapshot it would have.
+            self.text.edit_modified(False)
+            self._text_cache = None
 
     def open_file(self):
         path = filedialog.askopenfilename(title='Open C++ file', filetypes=[('C++ Files', '*.cpp *.hpp *.h *.cc *.c'), ('All Files', '*.*')])
         if path:
-            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                self.set_text(f.read())
-            # Clear undo history — the set_text insertions waste memory
-            try:
-                self.text.edit_reset()
-            except Exception:
-                pass
-            self.current_file = path
-            self.status_var.set(f'Opened {os.path.basename(path)}')
-            if hasattr(self, 'ext_manager') and self.ext_manager:
-                self.ext_manager.dispatch_file_open(path)
+            if os.path.getsize(path) > _MMAP_THRESHOLD:
+                self._load_mapped(path)
+            else:
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    self.set_text(f.read(), path)
+
+    def _load_mapped(self, path):
+        """Stream a large file into the editor through a read-only mmap."""
+        self._stream_text(self._mapped_chunks(path), path)
+
+    def _opened(self, path):
+        # Runs once the whole file is in the buffer (see _end_feed)
+        self.current_file = path
+        self.status_var.set(f'Opened {self._current_basename}')
+        if hasattr(self, 'ext_manager') and self.ext_manager:
+            self.ext_manager.dispatch_file_open(path)
+
+    @staticmethod
+    def _mapped_chunks(path):
+        # Incremental decoder so multi-byte characters split across chunk
+        # boundaries are not dropped, with newlines translated like the
+        # text-mode open() used for small files (a '\r\n' split across
+        # chunks included).  The map stays open until the generator is
+        # exhausted or closed.
+        decode = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder('utf-8')('ignore'), translate=True).decode
+        with open(path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for chunk in iter(lambda: mm.read(_READ_CHUNK), b''):
+                yield decode(chunk)
+        yield decode(b'', True)
 
     def save_file(self):
+        self._finish_feed()  # never write a half-loaded buffer
         if self.current_file is None:
             return self.save_file_as()
-        text = self.get_text()
+        # Write in line-aligned slices so the buffer is never copied to
+        # Python as a single str
+        res = self.text.count('1.0', 'end-1c', 'lines')
+        last = (res[0] if res else 0) + 1
         with open(self.current_file, 'w', encoding='utf-8') as f:
-            f.write(text)
-        self.status_var.set(f'Saved {os.path.basename(self.current_file)}')
+            for i in range(1, last + 1, _SAVE_CHUNK_LINES):
+                j = i + _SAVE_CHUNK_LINES
+                f.write(self.text.get(f'{i}.0', f'{j}.0' if j <= last else 'end-1c'))
+        self.status_var.set(f'Saved {self._current_basename}')
         self.set_dirty(False)
         if hasattr(self, 'ext_manager') and self.ext_manager:
             self.ext_manager.dispatch_file_save(self.current_file)
         return True
 
     def save_file_as(self):
+        self._finish_feed()  # a pending open would re-point current_file
         path = filedialog.asksaveasfilename(defaultextension='.cpp', filetypes=[('C++ Files', '*.cpp *.hpp *.h *.cc *.c'), ('All Files', '*.*')])
         if not path:
             return False
         self.current_file = path
         return self.save_file()
 
-    def set_text(self, txt):
+    def set_text(self, txt, path=None):
+        self._stream_text((txt[i:i + _INSERT_CHUNK]
+                           for i in range(0, len(txt), _INSERT_CHUNK)), path)
+
+    # ── Chunked loading ──────────────────────────────────────────────
+    def _stream_text(self, chunks, path=None):
+        """Replace the buffer with *chunks*, one insert per idle callback.
+
+        The event loop gets to paint between chunks, so large files no
+        longer freeze the window while they are inserted.  *path*, if
+        given, becomes the current file once the last chunk is in.
+        """
+        self._cancel_feed()
+        self._hl_gen += 1  # drop highlight results for the old buffer
+        self._syntax_gen += 1
         self.text.delete('1.0', 'end')
-        self.text.insert('1.0', txt)
+        self._feed = iter(chunks)
+        self._feed_path = path
+        self._feed_next(first=True)
+
+    def _cancel_feed(self):
+        if self._feed_job:
+            self.root.after_cancel(self._feed_job)
+            self._feed_job = None
+        if self._feed is not None:
+            close = getattr(self._feed, 'close', None)
+            if close:
+                close()
+            self._feed = None
+            self._feed_path = None
+            self.text.configure(state='normal')
+
+    def _feed_next(self, first=False):
+        self._feed_job = None
+        chunk = next(self._feed, None)
+        if chunk is not None:
+            self._insert_chunk(chunk)
+            if first:
+                # Let the visible region highlight while the rest streams in
+                self.update_highlight()
+            self._feed_job = self.root.after_idle(self._feed_next)
+            return
+        self._end_feed()
+
+    def _insert_chunk(self, chunk):
+        self.text.configure(state='normal')
+        self.text.insert('end-1c', chunk)
+        # Read-only until the load completes, so typing cannot interleave
+        # with the stream and then be marked clean by _end_feed
+        self.text.configure(state='disabled')
+
+    def _finish_feed(self):
+        """Insert the rest of a streaming load now (before save/build/run)."""
+        if self._feed is None:
+            return
+        if self._feed_job:
+            self.root.after_cancel(self._feed_job)
+            self._feed_job = None
+        for chunk in self._feed:
+            self._insert_chunk(chunk)
+        self._end_feed()
+
+    def _end_feed(self):
+        self._feed = None
+        self.text.configure(state='normal')
+        self._tagged_view = None  # whole buffer replaced: retag everything
         self.update_line_numbers()
         self.update_highlight()
+        # Programmatic loads are not undoable edits; drop their undo entries
+        try:
+            self.text.edit_reset()
+        except Exception:
+            pass
         # Reset dirty flag when setting text programmatically
         self.set_dirty(False)
+        path, self._feed_path = self._feed_path, None
+        if path is not None:
+            self._opened(path)
 
     def get_text(self):
-        return self.text.get('1.0', 'end-1c')
+        # Snapshot shared by every reader until the buffer next changes.
+        # <<Modified>> is queued, but Tk's flag is set by the edit itself,
+        # so a change earlier in this same event is not missed.
+        if self._text_cache is None or self.text.edit_modified():
+            self._text_cache = self.text.get('1.0', 'end-1c')
+        return self._text_cache
+
+    def _on_modified(self, event=None):
+        # <<Modified>> fires only when Tk's modified flag flips, so clear
+        # it again to be notified of the next change as well.  This is the
+        # one source of self.dirty: cursor keys and modifiers never reach it.
+        if self.text.edit_modified():
+            self.dirty = True
+            self._text_cache = None
+            self.text.edit_modified(False)
+            self._hl_gen += 1  # in-flight lexer results now have stale offsets
+            if not self._key_edit:
+                # Paste, drag-and-drop, menu undo or an extension edit: no
+                # key release reports the edited lines, so retag the viewport
+                self._tagged_view = None
+                self.update_highlight()
+            # yscrollcommand only fires when the scroll fractions move, which
+            # misses added/removed lines in a file that fits on screen
+            self.update_line_numbers()
 
     def update_line_numbers(self):
-        # Incremental: skip full rebuild if line count hasn't changed
-        content = self.get_text()
-        line_count = content.count('\n') + 1
-        if line_count == self._last_line_count:
-            return
-        self._last_line_count = line_count
-        width = len(str(max(1, line_count)))
-        self.line_numbers.config(state='normal')
-        self.line_numbers.delete('1.0', 'end')
-        nums = '\n'.join(str(i).rjust(width) for i in range(1, line_count + 1)) + '\n'
-        self.line_numbers.insert('end', nums)
-        self.line_numbers.config(state='disabled')
+        self.line_numbers.redraw()
 
     def update_highlight(self):
-        if self.highlight_timer:
-            self.root.after_cancel(self.highlight_timer)
-        self.highlight_timer = self.root.after(300, self._highlight_and_lines)
+        """Schedule the coalesced refresh unless one is already pending."""
+        if self._refresh_timer:
+            # The pending refresh re-checks _last_key_time and defers itself
+            # while typing continues, so no cancel/re-arm per keystroke
+            return
+        # Adaptive debounce: large buffers wait longer between refreshes
+        res = self.text.count('1.0', 'end', 'lines')
+        large = (res[0] if res else 0) > _LARGE_FILE_LINES
+        self._refresh_delay = _DEBOUNCE_LARGE_MS if large else _DEBOUNCE_MS
+        self._refresh_timer = self.root.after(self._refresh_delay, self._refresh)
 
-    def _highlight_and_lines(self):
+    def _refresh(self):
         """Batched debounce callback: update highlighting, line numbers, and insert undo separator."""
+        self._refresh_timer = None
+        # A key is still being held/typed: keep stale highlights a bit longer
+        idle_ms = int((time.monotonic() - self._last_key_time) * 1000)
+        if idle_ms < self._refresh_delay:
+            self._refresh_timer = self.root.after(self._refresh_delay - idle_ms, self._refresh)
+            return
         self.update_line_numbers()
         self._highlight()
         # Insert a manual undo separator (autoseparators=False)
@@ -285,44 +694,133 @@ int main() {
         # Use external Pygments-based SyntaxHighlighter if available
         if self.highlighter:
             lang = self.lang_var.get() if hasattr(self, 'lang_var') else 'cpp'
+            # Resolve the lexer only when the language changes
+            if lang != self._cached_lang:
+                self._cached_lexer = self.highlighter.get_lexer(lang)
+                self._cached_lang = lang
+            lexer = self._cached_lexer
+            # Prefer highlighting the visible region; the lexing pass runs
+            # on the lexer worker and the tags are applied back here
+            self._hl_gen += 1
             try:
-                # Prefer highlighting visible region for performance
-                self.highlighter.highlight_visible_region(language=lang)
+                window = self.highlighter.visible_window()
             except Exception:
-                self.highlighter.highlight_all(language=lang)
+                self.highlighter.highlight_all(language=lang, lexer=lexer)
+                return
+            if window is None:
+                return
+            gen = self._hl_gen
+            first_line = int(window[0].split('.')[0])
+            if lang in ('cpp', 'c'):
+                # Single-regex tokenizer instead of Pygments' state machine
+                job = (self.highlighter.cpp_ranges, window[2], first_line)
+            else:
+                job = (self.highlighter.lex_ranges, window[2], lexer, first_line)
+            fut = self._track(self._lex_pool.submit(*job))
+            fut.add_done_callback(
+                lambda f: self.root.after(0, self._apply_highlight, gen, window, f))
             return
 
-        # Fallback: basic regex highlight
-        text = self.get_text()
-        self.text.tag_remove('keyword', '1.0', 'end')
-        self.text.tag_remove('type', '1.0', 'end')
-        self.text.tag_remove('string', '1.0', 'end')
-        self.text.tag_remove('comment', '1.0', 'end')
-        # Basic highlights
-        keywords = r'\b(if|else|for|while|return|break|continue|goto|switch|case|default|namespace|using|class|struct|template|typename|public|private|protected|virtual|override|constexpr)\b'
-        types = r'\b(int|long|short|float|double|char|void|bool|unsigned|signed|size_t|auto)\b'
-        for m in re.finditer(keywords, text):
-            start = f'1.0+{m.start()}c'
-            end = f'1.0+{m.end()}c'
-            self.text.tag_add('keyword', start, end)
-        for m in re.finditer(types, text):
-            start = f'1.0+{m.start()}c'
-            end = f'1.0+{m.end()}c'
-            self.text.tag_add('type', start, end)
-        # strings
-        for m in re.finditer(r'(".*?"|\'.*?\')', text):
-            start = f'1.0+{m.start()}c'
-            end = f'1.0+{m.end()}c'
-            self.text.tag_add('string', start, end)
-        # comments // and /* */
-        for m in re.finditer(r'//.*', text):
-            start = f'1.0+{m.start()}c'
-            end = f'1.0+{m.end()}c'
-            self.text.tag_add('comment', start, end)
-        for m in re.finditer(r'/\*.*?\*/', text, flags=re.DOTALL):
-            start = f'1.0+{m.start()}c'
-            end = f'1.0+{m.end()}c'
-            self.text.tag_add('comment', start, end)
+        # Fallback: basic regex highlight of the visible region only, so the
+        # cost per keystroke is O(viewport) rather than O(file)
+        first = self.text.index('@0,0 linestart')
+        last = self.text.index(f'@0,{self.text.winfo_height()} lineend')
+        text = self.text.get(first, last)
+        base_line = int(first.split('.')[0])
+        # Same viewport as last time and only key edits since: lines above
+        # the first edited one still carry correct tags, so Tk work starts
+        # there.  Anything else (scroll, resize, load) retags the viewport.
+        from_line = base_line
+        if (first, last) == self._tagged_view:
+            from_line = max(base_line, self._dirty_from)
+        self._tagged_view = (first, last)
+        self._dirty_from = _CLEAN
+        from_idx = f'{from_line}.0'
+        self.text.tag_remove('keyword', from_idx, last)
+        self.text.tag_remove('type', from_idx, last)
+        self.text.tag_remove('string', from_idx, last)
+        self.text.tag_remove('comment', from_idx, last)
+        # Lex line by line, carrying the open-block-comment state; spans
+        # come from the per-line cache, so only edited lines are rescanned.
+        # Columns map straight onto 'line.col' indices.
+        # Basic highlights: collect ranges per tag, then one multi-range
+        # 'tag add' per tag instead of one Tcl call per match
+        ranges = {'keyword': [], 'type': [], 'string': [], 'comment': []}
+        in_block = False
+        for lineno, line in enumerate(text.split('\n'), base_line):
+            spans, in_block = _line_spans(line, in_block)
+            if lineno < from_line:
+                continue
+            for tag, s, e in spans:
+                ranges[tag] += (f'{lineno}.{s}', f'{lineno}.{e}')
+        for tag, idx in ranges.items():
+            if idx:
+                self.text.tag_add(tag, *idx)
+
+    # ── Background syntax check ─────────────────────────────────────
+    def _schedule_syntax_check(self):
+        if not self._syntax_timer:
+            self._syntax_timer = self.root.after(_SYNTAX_CHECK_MS, self._start_syntax_check)
+
+    def _start_syntax_check(self):
+        self._syntax_timer = None
+        # Typing continued after this was armed: wait out the rest of the pause
+        idle_ms = int((time.monotonic() - self._last_key_time) * 1000)
+        if idle_ms < _SYNTAX_CHECK_MS:
+            self._syntax_timer = self.root.after(_SYNTAX_CHECK_MS - idle_ms, self._start_syntax_check)
+            return
+        if not self._gxx_available or self._closing or self.lang_var.get() != 'cpp':
+            return
+        source = self.get_text()
+        if source == self._syntax_source:
+            return  # cursor movement only; nothing new to check
+        self._syntax_source = source
+        self._syntax_gen += 1
+        gen = self._syntax_gen
+        fut = self._track(self._pool.submit(self._syntax_check, source,
+                                            _quote_dir(self.current_file)))
+        fut.add_done_callback(
+            lambda f: self.root.after(0, self._apply_syntax_check, gen, f))
+
+    @staticmethod
+    def _syntax_check(source, include_dir):
+        """Run g++ -fsyntax-only on *source* via stdin and return its stderr.
+
+        No code generation, assembly or linking, and nothing is written to
+        disk, so this is far cheaper than a build.  *include_dir* is
+        searched for local ``#include "..."`` headers.
+        """
+        proc = subprocess.run(
+            ['g++', '-fsyntax-only', '-pipe', '-std=c++17', '-iquote', include_dir,
+             '-x', 'c++', '-'],
+            input=source, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True, errors='replace', timeout=_RUN_TIMEOUT)
+        return proc.stderr
+
+    def _apply_syntax_check(self, gen, fut):
+        if gen != self._syntax_gen or self._closing:
+            return  # the buffer changed while g++ was running
+        try:
+            stderr = fut.result()
+        except FileNotFoundError:
+            log.info("g++ not found; background syntax checking disabled")
+            self._gxx_available = False
+            return
+        except Exception:
+            log.debug("Background syntax check failed", exc_info=True)
+            return
+        self._parse_and_highlight_errors(stderr, stdin=True)
+
+    def _apply_highlight(self, gen, window, fut):
+        """Apply lexer-worker output unless the buffer moved on since."""
+        if gen != self._hl_gen or self._closing:
+            return  # stale: an edit or a newer pass superseded this one
+        try:
+            ranges = fut.result()
+        except Exception:
+            log.exception("Background highlighting failed")
+            return
+        self.highlighter.apply_window(window, ranges)
 
     def compile_code(self):
         if not self.save_file():
@@ -336,157 +834,227 @@ int main() {
         self.status_var.set('Compiling...')
         if hasattr(self, 'ext_manager') and self.ext_manager:
             self.ext_manager.dispatch_build_start()
-        threading.Thread(target=self._compile_thread, args=(path,), daemon=True).start()
+        self._submit(self._compile_thread, path, self._current_exe)
 
-    def _compile_thread(self, path):
-        base, ext = os.path.splitext(path)
-        out_exe = base  # without extension; on Linux, no .exe
+    def _compile_thread(self, path, out_exe):
         cmd = ['g++', '-std=c++17', path, '-o', out_exe]
+        digest = _source_digest(path)
         try:
-            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            self.current_process = proc
-            try:
-                stdout, stderr = proc.communicate()
-            finally:
-                self.current_process = None
+            returncode, stderr = self._run_gxx(cmd)
         except Exception as e:
             self.output_write(f'Error running g++: {e}\n')
             self.status_var.set('Compilation failed')
             return
-        if proc.returncode != 0:
-            self.output_write('Compiler returned errors:\n', clear=False)
-            self.output_write(stderr)
+        if returncode != 0:
+            self.output_write('Compiler returned errors.\n', clear=False)
             self.status_var.set('Compilation failed')
             self._parse_and_highlight_errors(stderr)
             if hasattr(self, 'ext_manager') and self.ext_manager:
                 self.ext_manager.dispatch_build_end(False)
         else:
+            self._record_build(path, out_exe, digest)
             self.output_write('Compilation succeeded.\n')
             self.status_var.set('Compiled')
             if hasattr(self, 'ext_manager') and self.ext_manager:
                 self.ext_manager.dispatch_build_end(True)
 
-    def _parse_and_highlight_errors(self, stderr_text):
+    def _run_gxx(self, cmd, source=None):
+        """Run g++, echoing diagnostics as they arrive.
+
+        *source*, if given, is piped to g++'s stdin.  Returns
+        ``(returncode, stderr_text)``; the text is kept for
+        _parse_and_highlight_errors.
+        """
+        # g++ reports on stderr only; stdout is discarded, not piped
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                stdin=subprocess.PIPE if source is not None else None,
+                                bufsize=1, text=True, errors='replace')
+        self.current_process = proc
+        if source is not None:
+            # Feed stdin from its own thread so a chatty stderr can't deadlock
+            threading.Thread(target=_write_and_close, args=(proc.stdin, source),
+                             daemon=True).start()
+        lines = []
+        try:
+            with proc.stderr:
+                for line in proc.stderr:
+                    lines.append(line)
+                    self.output_write(line)
+            returncode = proc.wait()
+        finally:
+            self.current_process = None
+        return returncode, ''.join(lines)
+
+    def _submit(self, fn, *args):
+        """Queue a compile/run job on the shared worker pool."""
+        fut = self._track(self._pool.submit(fn, *args))
+        fut.add_done_callback(self._on_job_done)
+        return fut
+
+    def _track(self, fut):
+        self._pending.add(fut)
+        fut.add_done_callback(self._pending.discard)
+        return fut
+
+    @staticmethod
+    def _on_job_done(fut):
+        # Futures swallow exceptions; surface them the way a bare thread did
+        if not fut.cancelled() and fut.exception() is not None:
+            log.error("Build job failed", exc_info=fut.exception())
+
+    def _scratch_dir(self):
+        """Private temp directory for builds of unsaved buffers."""
+        if self._scratch is None:
+            self._scratch = tempfile.mkdtemp(prefix='scc-')
+        return self._scratch
+
+    def _record_build(self, path, exe, digest):
+        try:
+            self._build_cache[path] = (digest, os.path.getmtime(exe), exe)
+        except OSError:
+            self._build_cache.pop(path, None)
+
+    def _parse_and_highlight_errors(self, stderr_text, stdin=False):
         # Parse messages like: file.cpp:line:col: error: message
         # Simplify: highlight line numbers in the current editor
         for tag in ('error_line',):
             self.text.tag_remove(tag, '1.0', 'end')
-        pattern = re.compile(r'(?P<file>[^:\s]+):(\s?)(?P<line>\d+):(\d+):\s(?P<kind>error|warning):\s(?P<msg>.*)')
-        for m in pattern.finditer(stderr_text):
+        if stdin:
+            current = '<stdin>'  # source was piped in (syntax check)
+        elif not self.current_file:
+            return
+        else:
+            current = self._current_basename
+        # Diagnostics start a line, so an anchored match per line suffices
+        lines = {}
+        is_current = {}  # diagnostic file name -> refers to the open file?
+        for text_line in stderr_text.splitlines():
+            m = _GCC_DIAG_RE.match(text_line)
+            if not m:
+                continue
             file = m.group('file')
-            line = int(m.group('line'))
-            if self.current_file and os.path.basename(self.current_file) == os.path.basename(file):
-                # highlight this line
-                start = f'{line}.0'
-                end = f'{line}.0 + 1 line'
-                self.text.tag_add('error_line', start, end)
+            hit = is_current.get(file)
+            if hit is None:
+                hit = is_current[file] = current == os.path.basename(file)
+            if hit:
+                lines[int(m.group('line'))] = None
+        # Highlight every reported line with one multi-range 'tag add'
+        ranges = []
+        for line in lines:
+            ranges += (f'{line}.0', f'{line + 1}.0')
+        if ranges:
+            self.text.tag_add('error_line', *ranges)
 
 
     def run_program(self):
+        self._finish_feed()
         if self.current_file is None:
             messagebox.showerror('Error', 'Please save and compile your source file first.')
             return
-        base, ext = os.path.splitext(self.current_file)
-        exe = base
+        exe = self._current_exe
         if not os.path.exists(exe):
             messagebox.showerror('Error', 'Executable not found. Compile first.')
             return
+        # Unsaved edits or a save after the last build mean exe is stale
+        if self.dirty or os.path.getmtime(self.current_file) > os.path.getmtime(exe):
+            if messagebox.askyesno('Stale build', 'Source is newer than the executable. Rebuild before running?'):
+                return self.compile_and_run()
         self.output_clear()
         self.status_var.set('Running...')
-        threading.Thread(target=self._run_thread, args=(exe,), daemon=True).start()
+        self._submit(self._run_thread, exe)
 
     def _run_thread(self, exe):
+        """Run *exe*, forwarding its output to the console as it arrives."""
         try:
-            proc = subprocess.Popen([exe], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            self.current_process = proc
-            try:
-                stdout, stderr = proc.communicate(timeout=20)
-            except subprocess.TimeoutExpired:
-                proc.kill()
-                stdout, stderr = proc.communicate()
-                self.current_process = None
-                self.output_write('\nProgram timed out (20s).\n')
-                self.status_var.set('Program timed out')
-                return
-            self.current_process = None
-        except subprocess.TimeoutExpired:
-            self.output_write('\nProgram timed out (20s).\n')
-            self.status_var.set('Program timed out')
-            return
+            proc = subprocess.Popen([exe], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    bufsize=1, text=True, errors='replace')
         except Exception as e:
             self.output_write(f'Error running program: {e}\n')
             self.status_var.set('Run failed')
             return
-        if stdout:
-            self.output_write(stdout)
-        if stderr:
-            self.output_write(stderr)
+        self.current_process = proc
+        # Deadline enforced by a timer so the reader loop never has to poll
+        timed_out = threading.Event()
+
+        def expire():
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(_RUN_TIMEOUT, expire)
+        timer.daemon = True
+        timer.start()
         try:
-            retcode = proc.returncode
-        except Exception:
-            retcode = 0
+            with proc.stdout:
+                for line in proc.stdout:
+                    self.output_write(line)
+            retcode = proc.wait()
+        finally:
+            timer.cancel()
+            self.current_process = None
+        if timed_out.is_set():
+            self.output_write(f'\nProgram timed out ({_RUN_TIMEOUT}s).\n')
+            self.status_var.set('Program timed out')
+            return
         self.status_var.set(f'Execution finished (code {retcode})')
 
     def compile_and_run(self):
-        if not self.save_file():
-            return
-        path = self.current_file
+        self._finish_feed()
         self.output_clear()
         self.status_var.set('Compiling and running...')
-        threading.Thread(target=self._compile_and_run_thread, args=(path,), daemon=True).start()
-
-    def _compile_and_run_thread(self, path):
-        base, ext = os.path.splitext(path)
-        exe = base
-        cmd = ['g++', '-std=c++17', path, '-o', exe]
+        if self.dirty or self.current_file is None:
+            # Transient build of the buffer: g++ reads it from stdin, so
+            # nothing is written to disk (explicit Save still persists)
+            self._submit(self._compile_and_run_thread, None, None, self.get_text(),
+                         self.current_file)
+        else:
+            self._submit(self._compile_and_run_thread, self.current_file, self._current_exe)
+
+    def _compile_and_run_thread(self, path, exe, source=None, src_file=None):
+        if path is None:
+            # Buffer of *src_file* (if saved before): its directory stays on
+            # the quote-include path and __FILE__ still names it
+            key = _BUFFER_KEY
+            if src_file:
+                source = _line_directive(src_file) + source
+            digest = hashlib.blake2b(source.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+            cached = self._build_cache.get(key)
+            if cached is not None and cached[0] == digest:
+                exe = cached[2]
+            else:
+                # A fresh name per build, so two queued builds on the pool
+                # never overwrite each other's executable
+                exe = os.path.join(self._scratch_dir(), f'a{next(self._build_ids)}.out')
+            cmd = ['g++', '-std=c++17', '-iquote', _quote_dir(src_file),
+                   '-x', 'c++', '-', '-o', exe]
+        else:
+            key = path
+            cmd = ['g++', '-std=c++17', path, '-o', exe]
+            digest = _source_digest(path)
         try:
-            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            self.current_process = proc
-            try:
-                stdout, stderr = proc.communicate()
-            finally:
-                self.current_process = None
+            exe_mtime = os.path.getmtime(exe)
+        except OSError:
+            exe_mtime = None
+        if exe_mtime is not None and self._build_cache.get(key) == (digest, exe_mtime, exe):
+            # Same source bytes and the executable we built is untouched
+            self.status_var.set('Using cached build')
+            self.output_write('Source unchanged, using cached build. Running...\n')
+            self._run_thread(exe)
+            return
+        try:
+            returncode, stderr = self._run_gxx(cmd, source)
         except Exception as e:
             self.output_write(f'Error running g++: {e}\n')
             self.status_var.set('Compilation failed')
             return
-        if proc.returncode != 0:
-            self.output_write('Compilation failed:\n')
-            self.output_write(stderr)
+        if returncode != 0:
+            self.output_write('Compilation failed.\n')
             self.status_var.set('Compilation failed')
-            self._parse_and_highlight_errors(stderr)
+            # With a #line prefix g++ reports the file's own name
+            self._parse_and_highlight_errors(stderr, stdin=path is None and not src_file)
             return
+        self._record_build(key, exe, digest)
         self.output_write('Compilation succeeded. Running...\n')
-        try:
-            runproc = subprocess.Popen([exe], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            self.current_process = runproc
-            try:
-                out, err = runproc.communicate(timeout=20)
-            except subprocess.TimeoutExpired:
-                runproc.kill()
-                out, err = runproc.communicate()
-                self.current_process = None
-                self.output_write('\nProgram timed out (20s).\n')
-                self.status_var.set('Program timed out')
-                return
-            self.current_process = None
-        except subprocess.TimeoutExpired:
-            self.output_write('\nProgram timed out (20s).\n')
-            self.status_var.set('Program timed out')
-            return
-        except Exception as e:
-            self.output_write(f'Error running program: {e}\n')
-            self.status_var.set('Run failed')
-            return
-        if out:
-            self.output_write(out)
-        if err:
-            self.output_write(err)
-        try:
-            ret = runproc.returncode
-        except Exception:
-            ret = 0
-        self.status_var.set(f'Execution finished (code {ret})')
+        self._run_thread(exe)
 
     def stop_current_process(self):
         proc = getattr(self, 'current_process', None)
@@ -509,8 +1077,14 @@ int main() {
         self._closing = True
         log.info("Closing editor…")
 
-        # 1. Kill any running subprocess
+        # 1. Kill any running subprocess and drop queued jobs
         self.stop_current_process()
+        for fut in list(self._pending):
+            fut.cancel()  # no-op for jobs already running
+        self._pool.shutdown(wait=False)
+        self._lex_pool.shutdown(wait=False)
+        if self._scratch:
+            shutil.rmtree(self._scratch, ignore_errors=True)
 
         # 2. Shut down extensions
         if self.ext_manager:
@@ -531,13 +1105,29 @@ int main() {
 
     # ── Geometry persistence ─────────────────────────────────────────
     def _save_geometry(self):
+        if self._geometry_saved:
+            return  # on_close and the atexit safety net both land here
         try:
             data = {"geometry": self.root.geometry()}
-            _CONFIG_FILE.write_text(json.dumps(data, indent=2))
+            # Write a sibling temp file and rename over the config, so a
+            # crash mid-write never leaves a truncated JSON behind
+            tmp = _CONFIG_FILE.with_suffix('.tmp')
+            tmp.write_text(json.dumps(data, indent=2))
+            os.replace(tmp, _CONFIG_FILE)
+            self._geometry_saved = True
             log.debug("Saved geometry: %s", data["geometry"])
         except Exception:
             log.debug("Could not save geometry", exc_info=True)
 
+    def _on_first_map(self, event):
+        # Children's <Map> events reach the root's bindings too
+        if event.widget is not self.root or self._map_bind is None:
+            return
+        self.root.unbind('<Map>', self._map_bind)
+        self._map_bind = None
+        # Tk's redraw of the new window is already queued as an idle job
+        self.root.after_idle(self._restore_geometry)
+
     def _restore_geometry(self):
         try:
             if _CONFIG_FILE.exists():
@@ -550,20 +1140,45 @@ int main() {
             log.debug("Could not restore geometry", exc_info=True)
 
     def output_write(self, text, clear=False):
-        def _write():
+        # Safe from worker threads: deque.append is atomic and the Tk work
+        # happens in _pump_output on the main loop.
+        if clear:
+            self._out_queue.append(None)
+        self._out_queue.append(text)
+
+    def output_clear(self):
+        self._out_queue.append(None)
+
+    def _pump_output(self):
+        """Drain queued console output with one insert per tick."""
+        q = self._out_queue
+        busy = bool(q)
+        if busy:
+            clear = False
+            parts = []
+            while q:
+                item = q.popleft()
+                if item is None:
+                    clear = True
+                    parts.clear()
+                else:
+                    parts.append(item)
             self.output.config(state='normal')
             if clear:
                 self.output.delete('1.0', 'end')
-            # Cap output buffer: trim oldest 500 lines when exceeding 2000
-            if int(float(self.output.index('end'))) > 2000:
-                self.output.delete('1.0', '500.0')
-            self.output.insert('end', text)
-            self.output.see('end')
+            if parts:
+                chunk = ''.join(parts)
+                if chunk.count('\n') > _OUTPUT_MAX_LINES:
+                    # Only the tail would survive the cap; don't hand Tk the rest
+                    chunk = '\n'.join(chunk.rsplit('\n', _OUTPUT_KEEP_LINES)[1:])
+                self.output.insert('end', chunk)
+                # Cap output buffer: keep the newest lines only
+                lines = int(self.output.index('end-1c').split('.')[0])
+                if lines > _OUTPUT_MAX_LINES:
+                    self.output.delete('1.0', f'{lines - _OUTPUT_KEEP_LINES}.0')
+                self.output.see('end')
             self.output.config(state='disabled')
-        self.root.after(0, _write)
-
-    def output_clear(self):
-        self.root.after(0, lambda: (self.output.config(state='normal'), self.output.delete('1.0', 'end'), self.output.config(state='disabled')))
+        self.root.after(_OUTPUT_FLUSH_MS if busy else _OUTPUT_IDLE_MS, self._pump_output)
 
     # ── Extension helpers ────────────────────────────────────────
     def _open_marketplace(self):
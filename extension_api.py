@@ -7,15 +7,36 @@ a class that inherits from BaseExtension.
 """
 from __future__ import annotations
 
-import json
+import logging
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple
 
 if TYPE_CHECKING:
     import tkinter as tk
 
+# Settings/state JSON goes through orjson when it is installed (several
+# times faster both ways); stdlib json is the fallback.  Both produce bytes.
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    _json_loads = json.loads
+
+log = logging.getLogger("scc.extensions")
+
 # Settings are stored per-extension under extensions/settings/
 _SETTINGS_DIR = Path(__file__).parent / "extensions" / "settings"
+# set_setting calls within this window share one disk write
+_SETTINGS_FLUSH_MS = 200
 
 
 class BaseExtension:
@@ -32,21 +53,31 @@ class BaseExtension:
     author: str = "Unknown"
     icon: str = "🧩"  # emoji or single char used as visual badge
     category: str = "Other"  # Appearance | Editing | Tools | Languages | Other
-    tags: List[str] = []
+    tags: Sequence[str] = ()  # subclasses may use a list or tuple
 
     # ── Instance-level state (no longer shared mutable class defaults) ─
-    def __init_subclass__(cls, **kwargs):
-        """Ensure every subclass gets its own mutable containers."""
-        super().__init_subclass__(**kwargs)
-        # Prevent mutable class-level dicts from being shared across instances
-        # by ensuring subclasses don't inherit the parent's mutable containers.
+    # The framework's own per-instance state lives in slots; __dict__ stays
+    # so extensions can keep storing whatever attributes they like.
+    __slots__ = (
+        "_keybindings", "_settings_cache", "_defaults_cache",
+        "_settings_dirty", "_flush_job", "_editor", "_manager",
+        "_settings_file", "__dict__",
+    )
 
     def __init__(self):
-        # Each instance gets its own keybinding and settings dicts
-        self._keybindings: Dict[str, str] = {}
-        self._settings_cache: Dict[str, Any] = {}
-        self._settings_loaded = False
+        # Each instance gets its own keybinding and settings dicts; settings
+        # and defaults are loaded on first access (None = not yet)
+        # key sequence -> (router, handle): the manager that routes it and
+        # the callback, or (None, Tk funcid) for a direct binding made
+        # before a manager was attached
+        self._keybindings: Dict[str, Tuple[Any, Any]] = {}
+        self._settings_cache: Optional[Dict[str, Any]] = None
+        self._defaults_cache: Optional[Dict[str, Any]] = None
         self._settings_dirty = False
+        self._flush_job = None  # pending after() id of the coalesced write
+        self._settings_file: Optional[Path] = None  # see _settings_path
+        self._editor: Any = None  # set by ExtensionManager on activation
+        self._manager: Any = None  # ditto; owns the shared key routing
 
     # ── Lifecycle ────────────────────────────────────────────────────
     def activate(self, editor: Any) -> None:
@@ -100,6 +131,8 @@ class BaseExtension:
     def default_settings(self) -> Dict[str, Any]:
         """Override to declare configurable settings with defaults.
 
+        An extension that declares none gets no settings file at all.
+
         Example::
 
             def default_settings(self):
@@ -109,44 +142,81 @@ class BaseExtension:
 
     def get_setting(self, key: str) -> Any:
         """Read a persisted setting value (falls back to default)."""
-        if not self._settings_loaded:
-            self._settings_cache = self._load_settings()
-            self._settings_loaded = True
-        defaults = self.default_settings()
-        return self._settings_cache.get(key, defaults.get(key))
+        if self._settings_cache is None:
+            self._ensure_settings()
+        return self._settings_cache.get(key, self._defaults_cache.get(key))
 
     def set_setting(self, key: str, value: Any) -> None:
-        """Update a setting value (deferred write — flushed on shutdown)."""
-        if not self._settings_loaded:
-            self._settings_cache = self._load_settings()
-            self._settings_loaded = True
+        """Update a setting value (deferred write — coalesced, then flushed)."""
+        if self._settings_cache is None:
+            self._ensure_settings()
+        if not self._defaults_cache:
+            # Only declared settings are persisted; see default_settings
+            if not getattr(type(self), "_warned_undeclared", False):
+                type(self)._warned_undeclared = True
+                log.warning("%s declares no settings; ignoring set_setting(%r)",
+                            type(self).__name__, key)
+            return
         self._settings_cache[key] = value
         self._settings_dirty = True  # mark dirty, no disk write yet
+        # One write per burst of updates; without an editor (or event loop)
+        # the shutdown flush still persists it
+        if self._flush_job is None and self._editor is not None:
+            try:
+                self._flush_job = self._editor.root.after(
+                    _SETTINGS_FLUSH_MS, self._scheduled_flush)
+            except Exception:
+                pass
+
+    def _scheduled_flush(self) -> None:
+        self._flush_job = None
+        self.flush_settings()
 
     def flush_settings(self) -> None:
-        """Write settings to disk only if they changed. Called on shutdown."""
+        """Write settings to disk only if they changed.
+
+        Runs shortly after ``set_setting`` and again on deactivation and
+        shutdown, so a pending write is never lost.
+        """
+        if self._flush_job is not None:
+            try:
+                self._editor.root.after_cancel(self._flush_job)
+            except Exception:
+                pass
+            self._flush_job = None
         if self._settings_dirty:
             self._save_settings()
             self._settings_dirty = False
 
+    def _ensure_settings(self) -> None:
+        # default_settings() builds a fresh dict per call; keep one copy
+        self._defaults_cache = self.default_settings()
+        # Nothing declared means nothing persisted: skip the file entirely
+        self._settings_cache = self._load_settings() if self._defaults_cache else {}
+
     def _settings_path(self) -> Path:
-        _SETTINGS_DIR.mkdir(parents=True, exist_ok=True)
-        safe_name = self.__class__.__name__.lower()
-        return _SETTINGS_DIR / f"{safe_name}.json"
+        # The directory is created by ExtensionManager._ensure_dirs at
+        # startup (and by _save_settings if it has gone missing since)
+        if self._settings_file is None:
+            safe_name = self.__class__.__name__.lower()
+            self._settings_file = _SETTINGS_DIR / f"{safe_name}.json"
+        return self._settings_file
 
     def _load_settings(self) -> Dict[str, Any]:
-        p = self._settings_path()
-        if p.exists():
-            try:
-                return json.loads(p.read_text())
-            except Exception:
-                pass
-        return dict(self.default_settings())
+        try:
+            return _json_loads(self._settings_path().read_bytes())
+        except Exception:  # missing or unreadable: start from defaults
+            return dict(self._defaults_cache)
 
     def _save_settings(self) -> None:
         p = self._settings_path()
+        data = _json_dumps(self._settings_cache)
         try:
-            p.write_text(json.dumps(self._settings_cache, indent=2))
+            try:
+                p.write_bytes(data)
+            except FileNotFoundError:
+                p.parent.mkdir(parents=True, exist_ok=True)
+                p.write_bytes(data)
         except Exception:
             pass
 
@@ -158,17 +228,31 @@ class BaseExtension:
 
         The binding is automatically removed on ``deactivate``.
         """
-        bid = editor.text.bind(key_sequence, callback, add=True)
-        self._keybindings[key_sequence] = bid
+        if key_sequence in self._keybindings:
+            self.unregister_keybinding(editor, key_sequence)  # replace, don't leak
+        router = self._manager
+        if router is not None:
+            # One Tk binding per sequence, shared by all extensions
+            router.bind_key(key_sequence, callback)
+            self._keybindings[key_sequence] = (router, callback)
+            return
+        funcid = editor.text.bind(key_sequence, callback, add=True)
+        self._keybindings[key_sequence] = (None, funcid)
 
     def unregister_keybinding(self, editor: Any, key_sequence: str) -> None:
         """Remove a previously registered keybinding."""
-        bid = self._keybindings.pop(key_sequence, None)
-        if bid:
-            try:
-                editor.text.unbind(key_sequence, bid)
-            except Exception:
-                pass
+        entry = self._keybindings.pop(key_sequence, None)
+        if entry is None:
+            return
+        # Undo it the way it was registered, whatever _manager is now
+        router, handle = entry
+        if router is not None:
+            router.unbind_key(key_sequence, handle)
+            return
+        try:
+            editor.text.unbind(key_sequence, handle)
+        except Exception:
+            pass
 
     def unregister_all_keybindings(self, editor: Any) -> None:
         """Remove all keybindings registered by this extension."""
@@ -188,6 +272,10 @@ class BaseExtension:
     @staticmethod
     def get_text(editor: Any) -> str:
         """Return the full editor text content."""
+        # Prefer the editor's shared snapshot over a fresh buffer copy
+        getter = getattr(editor, "get_text", None)
+        if getter is not None:
+            return getter()
         return editor.text.get("1.0", "end-1c")
 
     @staticmethod
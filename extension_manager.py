@@ -6,20 +6,24 @@ of .py extension files from the ``extensions/`` directory.
 """
 from __future__ import annotations
 
+import compileall
 import importlib
 import importlib.util
-import json
 import logging
 import os
+import py_compile
 import re
 import sys
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partialmethod
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 log = logging.getLogger("scc.extensions")
 
-from extension_api import BaseExtension
+from extension_api import BaseExtension, _json_dumps, _json_loads
 
 # ── Paths ────────────────────────────────────────────────────────────
 EXTENSIONS_DIR = Path(__file__).parent / "extensions"
@@ -27,15 +31,42 @@ STATE_FILE = EXTENSIONS_DIR / "extensions.json"
 MARKETPLACE_DIR = Path(__file__).parent / "marketplace"
 
 # All known categories for filtering
-CATEGORIES = ["All", "Appearance", "Editing", "Tools", "Languages", "Other"]
+CATEGORIES: Tuple[str, ...] = ("All", "Appearance", "Editing", "Tools", "Languages", "Other")
+
+# Class-level metadata assignments, all six keys in one alternation.  Bytes
+# pattern: only the matched values are ever decoded.
+_META_RE = re.compile(
+    rb'^\s+(name|version|description|author|icon|category)\s*[=:]\s*["\'](.+?)["\']',
+    re.MULTILINE,
+)
+
+# Metadata reported for a record with no instance (lazy or failed load)
+_NO_META: Dict[str, Any] = {
+    "version": "?", "description": "", "author": "Unknown", "icon": "🧩",
+    "category": "Other", "tags": (), "has_settings": False,
+}
+
+
+def _py_sources(directory: Path) -> List[Path]:
+    """Sorted extension sources in *directory*, skipping ``_``-prefixed files."""
+    # One scandir pass with plain string checks; glob builds a Path per
+    # entry and pattern-matches in Python
+    try:
+        with os.scandir(directory) as it:
+            names = [e.name for e in it
+                     if e.name.endswith(".py") and not e.name.startswith("_")]
+    except OSError:
+        return []
+    names.sort()
+    return [directory / n for n in names]
 
 
 class ExtensionInfo:
     """Lightweight record that tracks a loaded extension module."""
 
     __slots__ = (
-        "module_name", "file_path", "module", "instance",
-        "enabled", "error", "_spec",
+        "module_name", "file_path", "module", "_instance", "_meta",
+        "enabled", "error",
     )
 
     def __init__(
@@ -53,42 +84,66 @@ class ExtensionInfo:
         self.instance = instance
         self.enabled = enabled
         self.error = error  # traceback string if load/activate failed
-        self._spec = None   # kept for lazy loading
+
+    @property
+    def instance(self) -> Optional[BaseExtension]:
+        return self._instance
+
+    @instance.setter
+    def instance(self, instance: Optional[BaseExtension]):
+        # The marketplace reads metadata on every render; snapshot it once
+        # per instance rather than calling into the extension each time
+        self._instance = instance
+        if not instance:
+            self._meta = _NO_META
+            return
+        try:
+            has_settings = bool(instance.default_settings())
+        except Exception:
+            has_settings = False
+        self._meta = {
+            "name": getattr(instance, "name", self.module_name),
+            "version": getattr(instance, "version", "?"),
+            "description": getattr(instance, "description", ""),
+            "author": getattr(instance, "author", "Unknown"),
+            "icon": getattr(instance, "icon", "🧩"),
+            "category": getattr(instance, "category", "Other"),
+            "tags": getattr(instance, "tags", ()),
+            "has_settings": has_settings,
+        }
 
     # handy metadata proxies
     @property
     def name(self) -> str:
-        return getattr(self.instance, "name", self.module_name) if self.instance else self.module_name
+        return self._meta.get("name", self.module_name)
 
     @property
     def version(self) -> str:
-        return getattr(self.instance, "version", "?") if self.instance else "?"
+        return self._meta["version"]
 
     @property
     def description(self) -> str:
-        return getattr(self.instance, "description", "") if self.instance else ""
+        return self._meta["description"]
 
     @property
     def author(self) -> str:
-        return getattr(self.instance, "author", "Unknown") if self.instance else "Unknown"
+        return self._meta["author"]
 
     @property
     def icon(self) -> str:
-        return getattr(self.instance, "icon", "🧩") if self.instance else "🧩"
+        return self._meta["icon"]
 
     @property
     def category(self) -> str:
-        return getattr(self.instance, "category", "Other") if self.instance else "Other"
+        return self._meta["category"]
 
     @property
-    def tags(self) -> list:
-        return getattr(self.instance, "tags", []) if self.instance else []
+    def tags(self) -> Sequence[str]:
+        return self._meta["tags"]
 
     @property
     def has_settings(self) -> bool:
-        if self.instance:
-            return bool(self.instance.default_settings())
-        return False
+        return self._meta["has_settings"]
 
 
 class ExtensionManager:
@@ -98,7 +153,13 @@ class ExtensionManager:
         self.editor = editor
         self.extensions: Dict[str, ExtensionInfo] = {}
         self._active: List[ExtensionInfo] = []  # pre-filtered active list
+        # hook name -> bound overrides among _active (see _hook_list)
+        self._hooks: Dict[str, List[Callable]] = {}
+        # key sequence -> callbacks from register_keybinding (see bind_key)
+        self._kb_table: Dict[str, List[Callable]] = {}
         self._shutting_down = False
+        # module name -> (st_mtime_ns, st_size) of the source last executed
+        self._mod_keys: Dict[str, Tuple[int, int]] = {}
         # Marketplace cache
         self._marketplace_cache: Optional[List[Dict[str, str]]] = None
         self._marketplace_mtime: float = 0.0
@@ -120,21 +181,25 @@ class ExtensionManager:
     def _load_state(self):
         """Load persisted enabled/disabled flags."""
         self._state: Dict[str, bool] = {}
-        if STATE_FILE.exists():
-            try:
-                with open(STATE_FILE, "r") as f:
-                    self._state = json.load(f)
-            except Exception:
-                self._state = {}
+        self._last_state_bytes: Optional[bytes] = None  # as last read/written
+        try:
+            self._last_state_bytes = STATE_FILE.read_bytes()
+            self._state = _json_loads(self._last_state_bytes)
+        except Exception:
+            self._state = {}
 
     def _save_state(self):
-        current = {name: info.enabled for name, info in self.extensions.items()}
+        # Only disabled extensions are recorded (a missing entry means
+        # enabled), so the usual all-enabled state is just "{}"
+        data = _json_dumps({
+            name: False for name, info in sorted(self.extensions.items())
+            if not info.enabled
+        })
         # Skip write if state unchanged (reduce SSD wear)
-        if hasattr(self, '_last_saved_state') and current == self._last_saved_state:
+        if data == self._last_state_bytes:
             return
-        with open(STATE_FILE, "w") as f:
-            json.dump(current, f, indent=2)
-        self._last_saved_state = current
+        STATE_FILE.write_bytes(data)
+        self._last_state_bytes = data
 
     def _rebuild_active(self):
         """Rebuild the pre-filtered list of active extensions."""
@@ -142,44 +207,110 @@ class ExtensionManager:
             info for info in self.extensions.values()
             if info.enabled and info.instance
         ]
+        self._hooks.clear()
+
+    def _hook_list(self, hook: str) -> List[Callable]:
+        """Bound *hook* methods of active extensions that override it.
+
+        Built once per change to the active set, so dispatch skips the
+        extensions that only inherit BaseExtension's no-op.
+        """
+        hooks = self._hooks.get(hook)
+        if hooks is None:
+            base = getattr(BaseExtension, hook)
+            hooks = self._hooks[hook] = [
+                getattr(info.instance, hook) for info in self._active
+                if getattr(type(info.instance), hook, base) is not base
+            ]
+        return hooks
 
     # ── Discovery & loading ──────────────────────────────────────────
     def discover_and_load(self):
         """Scan extensions/ for .py files, load & activate enabled ones."""
-        for py_file in sorted(EXTENSIONS_DIR.glob("*.py")):
+        to_load = []
+        for py_file in _py_sources(EXTENSIONS_DIR):
             mod_name = py_file.stem
-            if mod_name.startswith("_"):
-                continue
             if mod_name not in self.extensions:
                 log.debug("Discovered extension file: %s", py_file.name)
                 enabled = self._state.get(mod_name, True)
                 if enabled:
-                    self._load_extension(py_file)
+                    to_load.append(py_file)
                 else:
                     # Lazy: register without importing for disabled extensions
                     self._register_lazy(py_file, mod_name)
+        if len(to_load) > 1:
+            # Execute the module bodies concurrently so their file I/O
+            # overlaps; _load_extension then picks them up from sys.modules.
+            # Instantiation and activation touch Tk, so they stay serial.
+            workers = min(8, os.cpu_count() or 1, len(to_load))
+            with ThreadPoolExecutor(workers, thread_name_prefix="scc-ext") as pool:
+                list(pool.map(self._prefetch, to_load))
+        for py_file in to_load:
+            self._load_extension(py_file)
         self._rebuild_active()
+        # The editor sets sys.dont_write_bytecode, so the import system never
+        # caches extension bytecode; compileall ignores that flag and only
+        # writes entries that are missing or stale
+        threading.Thread(
+            target=compileall.compile_dir, args=(str(EXTENSIONS_DIR),),
+            kwargs={"maxlevels": 0, "quiet": 1},
+            name="scc-ext-pyc", daemon=True,
+        ).start()
+
+    def _prefetch(self, path: Path):
+        try:
+            self._exec_source(path.stem, path)
+        except Exception:
+            pass  # re-raised and reported by _load_extension on the main thread
 
     def _register_lazy(self, path: Path, mod_name: str):
         """Register a disabled extension without importing its module."""
         info = ExtensionInfo(mod_name, path, enabled=False)
-        # Try to get metadata via quick parse (no import)
-        meta = self._quick_parse_meta(path)
-        # Store parsed metadata for display purposes (create a stub)
-        info._spec = meta
+        # Metadata via quick parse (no import), so the marketplace shows the
+        # real name/version/etc. until the extension is enabled
+        info._meta = {**_NO_META, **self._quick_parse_meta(path)}
         self.extensions[mod_name] = info
 
+    @staticmethod
+    def _source_key(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _exec_source(self, mod_name: str, path: Path) -> Any:
+        """Import *path* as ``ext_<mod_name>``; None if it has no loader.
+
+        A module this manager already executed from the same, unchanged
+        source is returned from ``sys.modules`` as is.
+        """
+        key = self._source_key(path)  # taken before exec: edits during it count
+        existing = sys.modules.get(f"ext_{mod_name}")
+        if (
+            existing is not None and key is not None
+            and self._mod_keys.get(mod_name) == key
+            and getattr(existing, "__file__", None) == str(path)
+        ):
+            return existing
+        spec = importlib.util.spec_from_file_location(
+            f"ext_{mod_name}", str(path)
+        )
+        if spec is None or spec.loader is None:
+            return None
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        if key is not None:
+            self._mod_keys[mod_name] = key
+        return module
+
     def _load_extension(self, path: Path) -> Optional[ExtensionInfo]:
         mod_name = path.stem
         try:
-            spec = importlib.util.spec_from_file_location(
-                f"ext_{mod_name}", str(path)
-            )
-            if spec is None or spec.loader is None:
+            module = self._exec_source(mod_name, path)
+            if module is None:
                 return None
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[spec.name] = module
-            spec.loader.exec_module(module)
 
             # find the Extension subclass
             ext_cls = self._find_extension_class(module)
@@ -199,7 +330,7 @@ class ExtensionManager:
             info = ExtensionInfo(mod_name, path, error=tb)
             info.enabled = False
             self.extensions[mod_name] = info
-            print(f"[ExtMgr] Failed to load {mod_name}:\n{tb}", file=sys.stderr)
+            log.error("Failed to load %s:\n%s", mod_name, tb)
             return info
 
     @staticmethod
@@ -230,6 +361,8 @@ class ExtensionManager:
         try:
             if info.instance:
                 log.info("Activating extension: %s", info.name)
+                info.instance._editor = self.editor  # for coalesced settings writes
+                info.instance._manager = self  # for shared keybindings
                 info.instance.activate(self.editor)
                 menubar = self._get_menubar()
                 if menubar:
@@ -246,14 +379,19 @@ class ExtensionManager:
                 # auto-cleanup keybindings
                 info.instance.unregister_all_keybindings(self.editor)
                 info.instance.deactivate(self.editor)
+                # reload/uninstall drop this instance: write pending settings now
+                info.instance.flush_settings()
         except Exception:
             log.exception("Deactivate failed for %s", info.module_name)
 
     def enable(self, mod_name: str):
         info = self.extensions.get(mod_name)
         if info and not info.enabled:
-            # Lazy load: if module wasn't imported yet, load it now
+            # Lazy load: if module wasn't imported yet, load it now.
+            # _load_extension activates according to the startup state,
+            # which still says disabled, so update that first.
             if info.module is None and info.instance is None:
+                self._state[mod_name] = True
                 loaded = self._load_extension(info.file_path)
                 if loaded:
                     info = loaded
@@ -291,6 +429,7 @@ class ExtensionManager:
             # remove from sys.modules
             sys_key = f"ext_{mod_name}"
             sys.modules.pop(sys_key, None)
+            self._mod_keys.pop(mod_name, None)
             del self.extensions[mod_name]
             self._rebuild_active()
             self._save_state()
@@ -306,6 +445,9 @@ class ExtensionManager:
             return False  # already installed
         try:
             shutil.copy2(str(marketplace_path), str(dest))
+            # Cached bytecode for this load and later startups (see
+            # discover_and_load on why the loader would not write it)
+            py_compile.compile(str(dest), doraise=False)
             info = self._load_extension(dest)
             if info:
                 self._rebuild_active()
@@ -314,27 +456,37 @@ class ExtensionManager:
                 self._marketplace_cache = None
                 return True
         except Exception:
-            traceback.print_exc()
+            log.exception("Install failed for %s", marketplace_path.name)
         return False
 
     # ── Hot-reload ───────────────────────────────────────────────────
-    def reload_extension(self, mod_name: str):
-        """Reload a single extension from disk."""
+    def reload_extension(self, mod_name: str, force: bool = True):
+        """Reload a single extension from disk.
+
+        An unchanged source file (same mtime and size) is not re-executed:
+        the loaded module is reused and only the instance is recreated, or
+        with ``force=False`` the extension is left alone entirely.
+        """
         info = self.extensions.get(mod_name)
         if not info:
             return
+        key = self._source_key(info.file_path)
+        unchanged = (
+            info.module is not None and key is not None
+            and self._mod_keys.get(mod_name) == key
+        )
+        if unchanged and not force:
+            return
         was_enabled = info.enabled
         if was_enabled:
             self._deactivate(info)
-        # reimport
+        # reimport, unless the source is untouched since it last ran
         try:
-            spec = importlib.util.spec_from_file_location(
-                f"ext_{mod_name}", str(info.file_path)
-            )
-            if spec and spec.loader:
-                module = importlib.util.module_from_spec(spec)
-                sys.modules[spec.name] = module
-                spec.loader.exec_module(module)
+            if unchanged:
+                module = info.module
+            else:
+                module = self._exec_source(mod_name, info.file_path)
+            if module is not None:
                 ext_cls = self._find_extension_class(module)
                 if ext_cls:
                     info.module = module
@@ -342,7 +494,7 @@ class ExtensionManager:
                     info.error = None
         except Exception:
             info.error = traceback.format_exc()
-            print(f"[ExtMgr] Reload failed for {mod_name}:\n{info.error}", file=sys.stderr)
+            log.error("Reload failed for %s:\n%s", mod_name, info.error)
         if was_enabled:
             info.enabled = True
             self._activate(info)
@@ -351,7 +503,7 @@ class ExtensionManager:
     def reload_all(self):
         """Reload every installed extension."""
         for mod_name in list(self.extensions.keys()):
-            self.reload_extension(mod_name)
+            self.reload_extension(mod_name, force=False)
         # also pick up newly added files
         self.discover_and_load()
 
@@ -384,46 +536,63 @@ class ExtensionManager:
                     log.exception("on_shutdown failed for %s", mod_name)
         self._save_state()
         self._active.clear()
+        self._hooks.clear()
         log.info("All extensions shut down.")
 
-    # ── Event dispatch (uses pre-filtered active list) ───────────────
-    def dispatch_key(self, event) -> Optional[str]:
-        for info in self._active:
+    # ── Keybindings ──────────────────────────────────────────────────
+    def bind_key(self, key_sequence: str, callback: Callable):
+        """Route *key_sequence* to *callback* through one shared Tk binding.
+
+        The router stays bound once created: tkinter's ``unbind`` with a
+        funcid clears every binding on the sequence, the editor's included.
+        """
+        callbacks = self._kb_table.get(key_sequence)
+        if callbacks is None:
+            callbacks = self._kb_table[key_sequence] = []
+            self.editor.text.bind(
+                key_sequence,
+                lambda e, seq=key_sequence: self._route_key(seq, e),
+                add=True,
+            )
+        callbacks.append(callback)
+
+    def unbind_key(self, key_sequence: str, callback: Callable):
+        callbacks = self._kb_table.get(key_sequence)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+    def _route_key(self, key_sequence: str, event) -> Optional[str]:
+        for callback in tuple(self._kb_table.get(key_sequence, ())):
             try:
-                result = info.instance.on_key(self.editor, event)
-                if result == "break":
+                if callback(event) == "break":
                     return "break"
             except Exception:
-                traceback.print_exc()
+                log.exception("Keybinding %s failed", key_sequence)
         return None
 
-    def dispatch_file_open(self, path: str):
-        for info in self._active:
-            try:
-                info.instance.on_file_open(self.editor, path)
-            except Exception:
-                traceback.print_exc()
-
-    def dispatch_file_save(self, path: str):
-        for info in self._active:
+    # ── Event dispatch (uses per-hook lists of overrides) ────────────
+    def dispatch_key(self, event) -> Optional[str]:
+        for hook in self._hook_list("on_key"):
             try:
-                info.instance.on_file_save(self.editor, path)
+                if hook(self.editor, event) == "break":
+                    return "break"
             except Exception:
-                traceback.print_exc()
+                log.exception("on_key failed in %s", type(hook.__self__).__name__)
+        return None
 
-    def dispatch_build_start(self):
-        for info in self._active:
+    def _dispatch(self, hook_name: str, *args):
+        """Call *hook_name* on every active override, isolating failures."""
+        editor = self.editor
+        for hook in self._hook_list(hook_name):
             try:
-                info.instance.on_build_start(self.editor)
+                hook(editor, *args)
             except Exception:
-                traceback.print_exc()
+                log.exception("%s failed in %s", hook_name, type(hook.__self__).__name__)
 
-    def dispatch_build_end(self, success: bool):
-        for info in self._active:
-            try:
-                info.instance.on_build_end(self.editor, success)
-            except Exception:
-                traceback.print_exc()
+    dispatch_file_open = partialmethod(_dispatch, "on_file_open")
+    dispatch_file_save = partialmethod(_dispatch, "on_file_save")
+    dispatch_build_start = partialmethod(_dispatch, "on_build_start")
+    dispatch_build_end = partialmethod(_dispatch, "on_build_end")
 
     # ── Marketplace helpers ──────────────────────────────────────────
     def list_marketplace(self) -> List[Dict[str, str]]:
@@ -450,10 +619,8 @@ class ExtensionManager:
         # Rebuild cache
         self._marketplace_mtime = current_mtime
         all_results: List[Dict[str, str]] = []
-        for py_file in sorted(MARKETPLACE_DIR.glob("*.py")):
+        for py_file in _py_sources(MARKETPLACE_DIR):
             mod_name = py_file.stem
-            if mod_name.startswith("_"):
-                continue
             meta = self._quick_parse_meta(py_file)
             meta["module_name"] = mod_name
             meta["file_path"] = str(py_file)
@@ -481,16 +648,15 @@ class ExtensionManager:
         }
         try:
             # Read only first 2KB — metadata is always near the top
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            with open(path, "rb") as f:
                 src = f.read(2048)
-            for key in ("name", "version", "description", "author", "icon", "category"):
-                m = re.search(
-                    rf'^\s+{key}\s*[=:]\s*["\'](.+?)["\']',
-                    src,
-                    re.MULTILINE,
-                )
-                if m:
-                    meta[key] = m.group(1)
+            # One scan for every key; the first assignment of each wins
+            found = set()
+            for m in _META_RE.finditer(src):
+                key = m.group(1).decode("ascii")
+                if key not in found:
+                    found.add(key)
+                    meta[key] = m.group(2).decode("utf-8", "ignore")
         except Exception:
             pass
         return meta
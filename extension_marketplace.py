@@ -33,24 +33,103 @@ SEARCH_BG     = "#313244"
 BTN_BG        = "#45475a"
 DETAIL_BG     = "#232336"
 
+# Typing/filter changes within this window collapse into one list rebuild
+_REFRESH_DEBOUNCE_MS = 150
 
-def _card_hover_enter(card, hover_bg):
-    """Change only the card and its direct children bg on hover (no recursion)."""
-    try:
-        card.configure(bg=hover_bg)
-    except Exception:
-        pass
-    for child in card.winfo_children():
-        try:
-            child.configure(bg=hover_bg)
-        except Exception:
-            pass
-        # One level of nesting for header/left/right frames
-        for grandchild in child.winfo_children():
-            try:
-                grandchild.configure(bg=hover_bg)
-            except Exception:
-                pass
+
+class _CardView:
+    """One list card, built once and re-pointed at another item on each
+    refresh instead of being destroyed and rebuilt."""
+
+    __slots__ = ("frame", "icon", "name", "version", "badge", "category",
+                 "desc", "author", "right", "buttons", "commands", "bg_widgets")
+
+    def __init__(self, parent):
+        self.frame = card = tk.Frame(parent, bg=BG_CARD,
+                                     highlightbackground=BORDER, highlightthickness=1)
+        left = tk.Frame(card, bg=BG_CARD)
+        left.pack(side="left", fill="both", expand=True, padx=12, pady=4)
+
+        header = tk.Frame(left, bg=BG_CARD)
+        header.pack(fill="x")
+        self.icon = tk.Label(header, bg=BG_CARD, fg=FG, font=("Segoe UI Emoji", 16))
+        self.icon.pack(side="left", padx=(0, 8))
+        self.name = tk.Label(header, bg=BG_CARD, fg=FG, font=("Segoe UI", 12, "bold"))
+        self.name.pack(side="left")
+        self.version = tk.Label(header, bg=BG_CARD, fg=FG_DIM, font=("Segoe UI", 9))
+        self.version.pack(side="left", padx=(8, 0))
+        # status / error badge (installed cards only; see set_badge)
+        self.badge = tk.Label(header, bg=BG_CARD)
+        # category pill
+        self.category = tk.Label(header, bg=BORDER, fg=FG_DIM,
+                                 font=("Segoe UI", 8), padx=6, pady=1)
+        self.category.pack(side="left", padx=(8, 0))
+
+        self.desc = tk.Label(left, bg=BG_CARD, fg=FG_DIM, font=("Segoe UI", 10),
+                             anchor="w", wraplength=380)
+        self.desc.pack(fill="x", pady=(2, 0))
+        self.author = tk.Label(left, bg=BG_CARD, fg=FG_DIM,
+                               font=("Segoe UI", 9, "italic"), anchor="w")
+        self.author.pack(fill="x")
+
+        # right: buttons, created on demand by set_buttons
+        self.right = tk.Frame(card, bg=BG_CARD)
+        self.right.pack(side="right", padx=12, pady=4)
+        self.buttons: list[tk.Label] = []
+        self.commands: list = []
+
+        # Everything drawn on the card background; the category pill and the
+        # buttons keep their own colours while hovered.  Only buttons are
+        # created after this, so the list never needs rebuilding.
+        self.bg_widgets = (card, left, header, self.icon, self.name, self.version,
+                           self.badge, self.desc, self.author, self.right)
+        card.bind("<Enter>", lambda e: self._set_bg(BG_CARD_HOVER))
+        card.bind("<Leave>", self._on_leave)
+
+    def _on_leave(self, event):
+        # Moving onto a child (e.g. a button added on reuse) also sends
+        # <Leave>; keep the highlight until the pointer is off the card
+        w = self.frame.winfo_containing(event.x_root, event.y_root)
+        path = str(self.frame)
+        if w is not None and (str(w) == path or str(w).startswith(path + ".")):
+            return
+        self._set_bg(BG_CARD)
+
+    def _set_bg(self, bg):
+        for w in self.bg_widgets:
+            w.configure(bg=bg)
+
+    def set_badge(self, text=None, fg=FG, font=("Segoe UI", 9)):
+        """Show the status badge left of the category pill, or hide it."""
+        if text is None:
+            self.badge.pack_forget()
+            return
+        self.badge.configure(text=text, fg=fg, font=font)
+        self.badge.pack(side="left", padx=(12, 0), before=self.category)
+
+    def set_buttons(self, specs):
+        """Show one action button per ``(text, colour, command)`` in *specs*."""
+        for i, (text, fg_color, command) in enumerate(specs):
+            if i == len(self.buttons):
+                self.buttons.append(self._new_button(i))
+                self.commands.append(None)
+            self.commands[i] = command
+            btn = self.buttons[i]
+            btn.configure(text=text, fg=fg_color)
+            btn.pack(side="top", pady=2)
+        for btn in self.buttons[len(specs):]:
+            btn.pack_forget()
+
+    def _new_button(self, i):
+        btn = tk.Label(
+            self.right, bg=BTN_BG, font=("Segoe UI", 10, "bold"),
+            padx=14, pady=4, cursor="hand2", relief="flat",
+        )
+        # Looked up at click time, so rebinding the card needs no new bind
+        btn.bind("<Button-1>", lambda e: self.commands[i]())
+        btn.bind("<Enter>", lambda e: btn.configure(bg=BORDER))
+        btn.bind("<Leave>", lambda e: btn.configure(bg=BTN_BG))
+        return btn
 
 
 class ExtensionMarketplace(tk.Toplevel):
@@ -65,18 +144,29 @@ class ExtensionMarketplace(tk.Toplevel):
         self.configure(bg=BG)
         self.resizable(True, True)
 
+        self._refresh_after_id = None
         self._search_var = tk.StringVar()
-        self._search_var.trace_add("write", lambda *_: self._refresh())
+        self._search_var.trace_add("write", lambda *_: self._schedule_refresh())
         self._current_tab = "installed"
 
         # category filter
         from extension_manager import CATEGORIES
         self._categories = CATEGORIES
         self._cat_var = tk.StringVar(value="All")
-        self._cat_var.trace_add("write", lambda *_: self._refresh())
+        self._cat_var.trace_add("write", lambda *_: self._schedule_refresh())
 
         self._detail_frame: tk.Frame | None = None
 
+        # Snapshots of the manager's lists as (name_lc, mod_lc, category,
+        # item) tuples, so typing in the search box filters in memory with
+        # no per-keystroke .lower(); dropped by _invalidate after every action
+        self._inst_cache: list | None = None
+        self._avail_cache: list | None = None
+        # (tab, category, query, matching cache entries) of the last filter
+        self._last_filter: tuple | None = None
+        self._card_pool: list[_CardView] = []
+        self._counts_dirty = True
+
         self._build_ui()
         self._refresh()
 
@@ -148,6 +238,8 @@ class ExtensionMarketplace(tk.Toplevel):
         self._inner.bind("<Configure>",
                          lambda e: self._canvas.configure(scrollregion=self._canvas.bbox("all")))
         self._canvas_win = self._canvas.create_window((0, 0), window=self._inner, anchor="nw")
+        self._empty = tk.Label(self._inner, bg=BG, fg=FG_DIM,
+                               font=("Segoe UI", 12), pady=40)
         self._canvas.configure(yscrollcommand=self._scrollbar.set)
 
         self._canvas.pack(side="left", fill="both", expand=True)
@@ -180,161 +272,157 @@ class ExtensionMarketplace(tk.Toplevel):
         for tid, btn in self._tab_btns.items():
             btn.configure(fg=ACCENT if tid == tab_id else FG)
         self._close_detail()
+        # Files may have been dropped into the marketplace directory while
+        # the dialog was open; rescan it (and its tab count) on each switch
+        self._avail_cache = None
+        self._last_filter = None
+        self._counts_dirty = True
         self._refresh()
 
     # ── Refresh list ─────────────────────────────────────────────────
-    def _refresh(self):
-        for w in self._inner.winfo_children():
-            w.destroy()
+    def _schedule_refresh(self):
+        """Debounce search/category edits into a single _refresh."""
+        self._cancel_refresh()
+        self._refresh_after_id = self.after(_REFRESH_DEBOUNCE_MS, self._refresh)
+
+    def _cancel_refresh(self):
+        if self._refresh_after_id:
+            self.after_cancel(self._refresh_after_id)
+            self._refresh_after_id = None
 
+    def _refresh(self):
+        self._cancel_refresh()  # this rebuild covers any pending one
         query = self._search_var.get().lower().strip()
         cat = self._cat_var.get()
 
         if self._current_tab == "installed":
             items = self._get_installed(query, cat)
+            fill = self._fill_installed_card
         else:
             items = self._get_available(query, cat)
-
-        if not items:
-            empty = tk.Label(self._inner,
-                             text="No extensions found." if query or cat != "All"
-                                  else "No extensions yet.",
-                             bg=BG, fg=FG_DIM, font=("Segoe UI", 12), pady=40)
-            empty.pack()
+            fill = self._fill_available_card
+
+        # Reuse pooled cards; only a longer list than ever before creates any
+        for i, item in enumerate(items):
+            if i == len(self._card_pool):
+                self._card_pool.append(_CardView(self._inner))
+            card = self._card_pool[i]
+            fill(card, item)
+            card.frame.pack(fill="x", pady=4, ipady=6)
+        for card in self._card_pool[len(items):]:
+            card.frame.pack_forget()
+
+        if items:
+            self._empty.pack_forget()
+        else:
+            self._empty.configure(text="No extensions found." if query or cat != "All"
+                                  else "No extensions yet.")
+            self._empty.pack()
 
         count = len(items)
-        # Update tab label counts (use cached marketplace listing)
-        installed_count = len(self.manager.extensions)
-        available_list = self.manager.list_marketplace()
-        available_count = len(available_list)
-        self._tab_btns["installed"].config(text=f"📦 Installed ({installed_count})")
-        self._tab_btns["available"].config(text=f"🌐 Available ({available_count})")
+        if self._counts_dirty:
+            # Tab label counts only change with the extension set
+            installed_count = len(self.manager.extensions)
+            available_count = len(self._avail_cache if self._avail_cache is not None
+                                  else self.manager.list_marketplace())
+            self._tab_btns["installed"].config(text=f"📦 Installed ({installed_count})")
+            self._tab_btns["available"].config(text=f"🌐 Available ({available_count})")
+            self._counts_dirty = False
         self._status.config(
             text=f"Showing {count} extension{'s' if count != 1 else ''}"
         )
 
     # ── Card builders ────────────────────────────────────────────────
-    def _matches_cat(self, item_cat: str, selected: str) -> bool:
-        return selected == "All" or item_cat == selected
+    def _invalidate(self):
+        """Forget the cached listings after the extension set changed."""
+        self._inst_cache = None
+        self._avail_cache = None
+        self._last_filter = None
+        self._counts_dirty = True
+
+    def _candidates(self, tab: str, cache: list, query: str, cat: str) -> list:
+        """Entries of *cache* that can still match *query* in *cat*.
+
+        While the query only grows (typing "pyt" -> "pyth"), the previous
+        hits of the same tab and category are a superset of the new ones,
+        so only they are rescanned.
+        """
+        last = self._last_filter
+        if last is not None and last[:2] == (tab, cat) and query.startswith(last[2]):
+            return last[3]
+        return cache
 
     def _get_installed(self, query: str, cat: str):
-        items = []
-        for name, info in sorted(self.manager.extensions.items()):
-            if query and query not in info.name.lower() and query not in name.lower():
-                continue
-            if not self._matches_cat(info.category, cat):
-                continue
-            items.append(info)
-            self._make_installed_card(info)
-        return items
+        if self._inst_cache is None:
+            self._inst_cache = [
+                (info.name.lower(), name.lower(), info.category, info)
+                for name, info in sorted(self.manager.extensions.items())
+            ]
+        return self._filter("installed", self._inst_cache, query, cat)
 
     def _get_available(self, query: str, cat: str):
-        marketplace_items = self.manager.list_marketplace()
-        items = []
-        for meta in marketplace_items:
-            if query and query not in meta.get("name", "").lower() \
-                    and query not in meta.get("module_name", "").lower():
-                continue
-            if not self._matches_cat(meta.get("category", "Other"), cat):
-                continue
-            items.append(meta)
-            self._make_available_card(meta)
-        return items
+        if self._avail_cache is None:
+            self._avail_cache = [
+                (meta.get("name", "").lower(), meta.get("module_name", "").lower(),
+                 meta.get("category", "Other"), meta)
+                for meta in self.manager.list_marketplace()
+            ]
+        return self._filter("available", self._avail_cache, query, cat)
+
+    def _filter(self, tab: str, cache: list, query: str, cat: str) -> list:
+        """Items of *cache* entries ``(name_lc, mod_lc, category, item)``
+        whose lowercased names contain *query* and whose category is *cat*."""
+        any_cat = cat == "All"
+        hits = [
+            entry for entry in self._candidates(tab, cache, query, cat)
+            if (not query or query in entry[0] or query in entry[1])
+            and (any_cat or entry[2] == cat)
+        ]
+        self._last_filter = (tab, cat, query, hits)
+        return [entry[3] for entry in hits]
 
     # ── Installed card ───────────────────────────────────────────────
-    def _make_installed_card(self, info):
-        card = tk.Frame(self._inner, bg=BG_CARD,
-                        highlightbackground=BORDER, highlightthickness=1)
-        card.pack(fill="x", pady=4, ipady=6)
-        card.bind("<Enter>", lambda e, c=card: _card_hover_enter(c, BG_CARD_HOVER))
-        card.bind("<Leave>", lambda e, c=card: _card_hover_enter(c, BG_CARD))
-
-        left = tk.Frame(card, bg=BG_CARD)
-        left.pack(side="left", fill="both", expand=True, padx=12, pady=4)
-
-        header = tk.Frame(left, bg=BG_CARD)
-        header.pack(fill="x")
-        tk.Label(header, text=info.icon, bg=BG_CARD, fg=FG,
-                 font=("Segoe UI Emoji", 16)).pack(side="left", padx=(0, 8))
-        tk.Label(header, text=info.name, bg=BG_CARD, fg=FG,
-                 font=("Segoe UI", 12, "bold")).pack(side="left")
-        tk.Label(header, text=f"v{info.version}", bg=BG_CARD, fg=FG_DIM,
-                 font=("Segoe UI", 9)).pack(side="left", padx=(8, 0))
+    def _fill_installed_card(self, card: _CardView, info):
+        card.icon.configure(text=info.icon)
+        card.name.configure(text=info.name)
+        card.version.configure(text=f"v{info.version}")
 
         # status / error badge
         if info.error:
-            tk.Label(header, text="⚠ Error", bg=BG_CARD, fg=RED,
-                     font=("Segoe UI", 9, "bold")).pack(side="left", padx=(12, 0))
+            card.set_badge("⚠ Error", RED, ("Segoe UI", 9, "bold"))
         else:
             clr = GREEN if info.enabled else YELLOW
             txt = "● Enabled" if info.enabled else "● Disabled"
-            tk.Label(header, text=txt, bg=BG_CARD, fg=clr,
-                     font=("Segoe UI", 9)).pack(side="left", padx=(12, 0))
-
-        # category pill
-        tk.Label(header, text=info.category, bg=BORDER, fg=FG_DIM,
-                 font=("Segoe UI", 8), padx=6, pady=1).pack(side="left", padx=(8, 0))
-
-        tk.Label(left, text=info.description, bg=BG_CARD, fg=FG_DIM,
-                 font=("Segoe UI", 10), anchor="w",
-                 wraplength=380).pack(fill="x", pady=(2, 0))
-        tk.Label(left, text=f"by {info.author}", bg=BG_CARD, fg=FG_DIM,
-                 font=("Segoe UI", 9, "italic"), anchor="w").pack(fill="x")
+            card.set_badge(txt, clr)
 
-        # right: buttons
-        right = tk.Frame(card, bg=BG_CARD)
-        right.pack(side="right", padx=12, pady=4)
-
-        # detail button
-        self._action_btn(right, "Details", ACCENT,
-                         lambda i=info: self._show_installed_detail(i))
+        card.category.configure(text=info.category)
+        card.desc.configure(text=info.description)
+        card.author.configure(text=f"by {info.author}")
 
+        n = info.module_name
         if info.enabled:
-            self._action_btn(right, "Disable", YELLOW,
-                             lambda n=info.module_name: self._do_disable(n))
+            toggle = ("Disable", YELLOW, lambda: self._do_disable(n))
         else:
-            self._action_btn(right, "Enable", GREEN,
-                             lambda n=info.module_name: self._do_enable(n))
-
-        self._action_btn(right, "Reload", ORANGE,
-                         lambda n=info.module_name: self._do_reload(n))
-        self._action_btn(right, "Uninstall", RED,
-                         lambda n=info.module_name: self._do_uninstall(n))
+            toggle = ("Enable", GREEN, lambda: self._do_enable(n))
+        card.set_buttons((
+            ("Details", ACCENT, lambda: self._show_installed_detail(info)),
+            toggle,
+            ("Reload", ORANGE, lambda: self._do_reload(n)),
+            ("Uninstall", RED, lambda: self._do_uninstall(n)),
+        ))
 
     # ── Available card ───────────────────────────────────────────────
-    def _make_available_card(self, meta: dict):
-        card = tk.Frame(self._inner, bg=BG_CARD,
-                        highlightbackground=BORDER, highlightthickness=1)
-        card.pack(fill="x", pady=4, ipady=6)
-        card.bind("<Enter>", lambda e, c=card: _card_hover_enter(c, BG_CARD_HOVER))
-        card.bind("<Leave>", lambda e, c=card: _card_hover_enter(c, BG_CARD))
-
-        left = tk.Frame(card, bg=BG_CARD)
-        left.pack(side="left", fill="both", expand=True, padx=12, pady=4)
-
-        header = tk.Frame(left, bg=BG_CARD)
-        header.pack(fill="x")
-        tk.Label(header, text=meta.get("icon", "🧩"), bg=BG_CARD, fg=FG,
-                 font=("Segoe UI Emoji", 16)).pack(side="left", padx=(0, 8))
-        tk.Label(header, text=meta.get("name", ""), bg=BG_CARD, fg=FG,
-                 font=("Segoe UI", 12, "bold")).pack(side="left")
-        tk.Label(header, text=f"v{meta.get('version', '?')}", bg=BG_CARD, fg=FG_DIM,
-                 font=("Segoe UI", 9)).pack(side="left", padx=(8, 0))
-
-        # category pill
-        tk.Label(header, text=meta.get("category", "Other"), bg=BORDER, fg=FG_DIM,
-                 font=("Segoe UI", 8), padx=6, pady=1).pack(side="left", padx=(8, 0))
-
-        tk.Label(left, text=meta.get("description", ""), bg=BG_CARD, fg=FG_DIM,
-                 font=("Segoe UI", 10), anchor="w",
-                 wraplength=380).pack(fill="x", pady=(2, 0))
-        tk.Label(left, text=f"by {meta.get('author', 'Unknown')}", bg=BG_CARD, fg=FG_DIM,
-                 font=("Segoe UI", 9, "italic"), anchor="w").pack(fill="x")
-
-        right = tk.Frame(card, bg=BG_CARD)
-        right.pack(side="right", padx=12, pady=4)
-        self._action_btn(right, "Install", GREEN,
-                         lambda fp=meta["file_path"]: self._do_install(fp))
+    def _fill_available_card(self, card: _CardView, meta: dict):
+        card.icon.configure(text=meta.get("icon", "🧩"))
+        card.name.configure(text=meta.get("name", ""))
+        card.version.configure(text=f"v{meta.get('version', '?')}")
+        card.set_badge(None)
+        card.category.configure(text=meta.get("category", "Other"))
+        card.desc.configure(text=meta.get("description", ""))
+        card.author.configure(text=f"by {meta.get('author', 'Unknown')}")
+
+        fp = meta["file_path"]
+        card.set_buttons((("Install", GREEN, lambda: self._do_install(fp)),))
 
     # ── Detail panel ─────────────────────────────────────────────────
     def _show_installed_detail(self, info):
@@ -400,39 +488,32 @@ class ExtensionMarketplace(tk.Toplevel):
             self._detail_frame.destroy()
             self._detail_frame = None
 
-    # ── Action button ────────────────────────────────────────────────
-    def _action_btn(self, parent, text, fg_color, command):
-        btn = tk.Label(
-            parent, text=text, bg=BTN_BG, fg=fg_color,
-            font=("Segoe UI", 10, "bold"), padx=14, pady=4,
-            cursor="hand2", relief="flat",
-        )
-        btn.pack(side="top", pady=2)
-        btn.bind("<Button-1>", lambda e: command())
-        btn.bind("<Enter>", lambda e, b=btn: b.configure(bg=BORDER))
-        btn.bind("<Leave>", lambda e, b=btn: b.configure(bg=BTN_BG))
-
     # ── Actions ──────────────────────────────────────────────────────
     def _do_enable(self, mod_name: str):
         self.manager.enable(mod_name)
+        self._invalidate()
         self._refresh()
 
     def _do_disable(self, mod_name: str):
         self.manager.disable(mod_name)
+        self._invalidate()
         self._refresh()
 
     def _do_reload(self, mod_name: str):
         self.manager.reload_extension(mod_name)
+        self._invalidate()
         self._refresh()
 
     def _do_uninstall(self, mod_name: str):
         if messagebox.askyesno("Uninstall", f"Remove '{mod_name}'?", parent=self):
             self.manager.uninstall(mod_name)
+            self._invalidate()
             self._close_detail()
             self._refresh()
 
     def _do_install(self, file_path: str):
         ok = self.manager.install_from_marketplace(Path(file_path))
+        self._invalidate()
         if ok:
             self._switch_tab("installed")
         else:
@@ -442,4 +523,5 @@ class ExtensionMarketplace(tk.Toplevel):
 
     def destroy(self):
         # No need to unbind_all — we used scoped bind() on self
+        self._cancel_refresh()
         super().destroy()
@@ -7,12 +7,85 @@ Falls back to a simple tag-based approach if Pygments is not installed.
 Pygments is lazy-loaded on first use to reduce startup memory (~4-8 MB saved).
 Tags are "virtualized": only the visible region carries tags, off-screen tags
 are stripped to keep memory proportional to window height, not file size.
+
+``tokenize_cpp`` is a Pygments-free fast path for C/C++: one precompiled
+alternation regex scans the buffer inside the C regex engine and emits a flat
+``array('i')`` of ``(kind, start, end)`` triples instead of a Python tuple
+per token.  The editor lexes C/C++ through it (``cpp_ranges``); other
+languages still go through Pygments.
 """
+import re
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
 from typing import Any, Dict
 
+# ── Fast C++ tokenizer (no Pygments) ─────────────────────────────────
+# Token kinds are tag names, so a kind index maps straight onto a Text tag.
+CPP_TOKEN_KINDS = (
+    'comment', 'string', 'number', 'keyword', 'type', 'name',
+    'operator', 'punctuation',
+)
+_KIND_INDEX = {k: i for i, k in enumerate(CPP_TOKEN_KINDS)}
+
+_CPP_KEYWORDS = frozenset((
+    'alignas', 'alignof', 'break', 'case', 'catch', 'class', 'const',
+    'consteval', 'constexpr', 'constinit', 'const_cast', 'continue',
+    'decltype', 'default', 'delete', 'do', 'dynamic_cast', 'else', 'enum',
+    'explicit', 'export', 'extern', 'false', 'final', 'for', 'friend', 'goto',
+    'if', 'inline', 'mutable', 'namespace', 'new', 'noexcept', 'nullptr',
+    'operator', 'override', 'private', 'protected', 'public', 'register',
+    'reinterpret_cast', 'return', 'sizeof', 'static', 'static_assert',
+    'static_cast', 'struct', 'switch', 'template', 'this', 'throw', 'true',
+    'try', 'typedef', 'typeid', 'typename', 'union', 'using', 'virtual',
+    'volatile', 'while',
+))
+_CPP_TYPES = frozenset((
+    'auto', 'bool', 'char', 'char8_t', 'char16_t', 'char32_t', 'double',
+    'float', 'int', 'long', 'short', 'signed', 'size_t', 'unsigned', 'void',
+    'wchar_t',
+))
+
+_CPP_TOKEN_RE = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z)|^[ \t]*\#[^\n]*)
+  | (?P<string>"(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?)
+  | (?P<number>(?:0[xX][0-9a-fA-F']+|\d[\d']*\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)[uUlLfF]*)
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<operator>->\*?|<<=?|>>=?|\+\+|--|&&|\|\||::|\.\*|[-+*/%&|^!=<>]=?|[~?:])
+  | (?P<punctuation>[()\[\]{};,.])
+""", re.VERBOSE | re.DOTALL | re.MULTILINE)
+
+
+def tokenize_cpp(text: str) -> array:
+    """Tokenize C/C++ *text* into a flat ``array('i')`` of triples.
+
+    Each token occupies three consecutive slots: ``kind`` (an index into
+    ``CPP_TOKEN_KINDS``), ``start`` and ``end`` character offsets.
+    Whitespace and unrecognised characters are skipped.
+    """
+    out = array('i')
+    extend = out.extend
+    kind_index = _KIND_INDEX
+    name_kind = kind_index['name']
+    kw_kind = kind_index['keyword']
+    type_kind = kind_index['type']
+    keywords = _CPP_KEYWORDS
+    types = _CPP_TYPES
+    for m in _CPP_TOKEN_RE.finditer(text):
+        kind = kind_index[m.lastgroup]
+        if kind == name_kind:
+            word = m.group()
+            if word in keywords:
+                kind = kw_kind
+            elif word in types:
+                kind = type_kind
+        extend((kind, m.start(), m.end()))
+    return out
+
+
 # ── Lazy Pygments loading ────────────────────────────────────────────
 # We do NOT import pygments at module level.  The flag is set in __init__
-# and the actual library is loaded in _get_lexer / highlight_* on first call.
+# and the actual library is loaded in get_lexer / highlight_* on first call.
 PYGMENTS_AVAILABLE = False
 Token = None  # type: ignore
 _lex = None   # will be set to pygments.lex on first use
@@ -35,6 +108,11 @@ def _ensure_pygments():
         return False
 
 
+# Marks bounding the window last tagged by highlight_visible_region
+_WIN_FIRST = 'scc_hl_first'
+_WIN_LAST = 'scc_hl_last'
+
+
 class SyntaxHighlighter:
     # ── Lexer cache (shared across instances) ────────────────────────
     _lexer_cache: Dict[str, Any] = {}
@@ -77,6 +155,8 @@ class SyntaxHighlighter:
             'Name.Class': 'class',
         }
         self._all_tags = tuple(set(self.token_to_tag.values()))
+        # True while tags are confined to the _WIN_FIRST.._WIN_LAST window
+        self._window_marked = False
 
     def create_tags(self):
         # Define tags and basic colors; apps can configure them further
@@ -108,136 +188,185 @@ class SyntaxHighlighter:
             parent = parent.parent if hasattr(parent, 'parent') else None
         return ''
 
+    def lex_ranges(self, text: str, lexer, line: int = 1, col: int = 0) -> Dict[str, list]:
+        """Lex *text*, which starts at ``line.col``, into per-tag index lists.
+
+        Touches no Tk state, so it is safe to run on a worker thread.
+        """
+        ranges: Dict[str, list] = {}
+        for ttype, value in _lex(text, lexer):
+            if not value:
+                continue
+            tag = self._tag_name_for_token(ttype)
+            s_line, s_col = line, col
+            # count/rfind scan in C without building a list per token
+            newlines = value.count('\n')
+            if not newlines:
+                col += len(value)
+            else:
+                line += newlines
+                col = len(value) - value.rfind('\n') - 1
+            if tag:
+                ranges.setdefault(tag, []).extend((f'{s_line}.{s_col}', f'{line}.{col}'))
+        return ranges
+
+    @staticmethod
+    def cpp_ranges(text: str, line: int = 1) -> Dict[str, list]:
+        """``lex_ranges`` for C/C++ *text* starting at ``line.0``, via ``tokenize_cpp``.
+
+        No Pygments involved; also safe to run on a worker thread.
+        """
+        # Offset of the first character of each line in *text*
+        starts = [0, *accumulate(len(ln) + 1 for ln in text.split('\n'))]
+        kinds = CPP_TOKEN_KINDS
+        ranges: Dict[str, list] = {}
+        tokens = tokenize_cpp(text)
+        for i in range(0, len(tokens), 3):
+            start, end = tokens[i + 1], tokens[i + 2]
+            s = bisect_right(starts, start) - 1
+            e = bisect_right(starts, end, s) - 1
+            ranges.setdefault(kinds[tokens[i]], []).extend((
+                f'{line + s}.{start - starts[s]}', f'{line + e}.{end - starts[e]}'))
+        return ranges
+
+    def apply_ranges(self, ranges: Dict[str, list]):
+        """Apply ``lex_ranges`` output with one multi-range ``tag add`` per tag."""
+        for tag, idx in ranges.items():
+            try:
+                self.text.tag_add(tag, *idx)
+            except Exception:
+                pass
+
     # ── Cached lexer factory ─────────────────────────────────────────
     @classmethod
-    def _get_lexer(cls, language: str):
+    def get_lexer(cls, language: str):
         """Return a cached lexer instance for the given language."""
         lexer = cls._lexer_cache.get(language)
         if lexer is None:
             # Lazy import: only load lexer modules when actually needed
             from pygments.lexers import CppLexer, get_lexer_by_name
+            # Tokens are mapped back onto the widget by length, so the lexer
+            # must not strip leading/trailing newlines or append one
+            opts = {'stripnl': False, 'ensurenl': False}
             try:
                 if language == 'cpp' or not language:
-                    lexer = CppLexer()
+                    lexer = CppLexer(**opts)
                 else:
-                    lexer = get_lexer_by_name(language)
+                    lexer = get_lexer_by_name(language, **opts)
             except Exception:
-                lexer = CppLexer()
+                lexer = CppLexer(**opts)
             cls._lexer_cache[language] = lexer
         return lexer
 
-    def highlight_region(self, start_char: int, end_char: int, language: str = 'cpp'):
+    def highlight_region(self, start_char: int, end_char: int, language: str = 'cpp', lexer=None):
         """Highlight characters from start_char to end_char."""
+        self._window_marked = False
         if not PYGMENTS_AVAILABLE:
             return
-        text = self.text.get('1.0', 'end-1c')
-        selection_text = text[start_char:end_char]
-        start_idx = f'1.0+{start_char}c'
-        end_idx = f'1.0+{end_char}c'
+        # Resolve the character offset once; tokens then advance line.col.
+        # The end is counted from start_idx, so Tk walks only the region
+        # rather than the whole prefix a second time.
+        start_idx = self.text.index(f'1.0+{start_char}c')
+        end_idx = self.text.index(f'{start_idx}+{end_char - start_char}c')
+        selection_text = self.text.get(start_idx, end_idx)
         for tag in self._all_tags:
             self.text.tag_remove(tag, start_idx, end_idx)
 
-        lexer = self._get_lexer(language)
-        pos_in_full = start_char
-        for ttype, value in _lex(selection_text, lexer):
-            if not value:
-                continue
-            tag = self._tag_name_for_token(ttype)
-            if not tag:
-                pos_in_full += len(value)
-                continue
-            start = pos_in_full
-            end = pos_in_full + len(value)
-            pos_in_full = end
-            try:
-                self.text.tag_add(tag, f'1.0+{start}c', f'1.0+{end}c')
-            except Exception:
-                pass
+        if lexer is None:
+            lexer = self.get_lexer(language)
+        line, col = map(int, start_idx.split('.'))
+        self.apply_ranges(self.lex_ranges(selection_text, lexer, line, col))
 
-    def highlight_visible_region(self, language: str = 'cpp'):
+    def highlight_visible_region(self, language: str = 'cpp', lexer=None):
         """Highlight only the visible region — virtualized.
 
         Tags are applied ONLY to the visible window.  Off-screen tags are
         aggressively stripped so that tag memory stays O(window_height)
-        regardless of file size.
+        regardless of file size.  Callers that already hold a lexer from
+        ``get_lexer`` may pass it to skip the lookup.
         """
         if not PYGMENTS_AVAILABLE:
             return
         try:
-            # 1. Calculate visible bounds
-            first = self.text.index('@0,0')
-            last = self.text.index(f'@0,{self.text.winfo_height()}')
+            window = self.visible_window()
+            if window is None:
+                return
+            if lexer is None:
+                lexer = self.get_lexer(language)
+            # Lex and apply tags using line.col indices
+            first_line = int(window[0].split('.')[0])
+            self.apply_window(window, self.lex_ranges(window[2], lexer, first_line))
+        except Exception:
+            self.highlight_all(language=language, lexer=lexer)
 
-            first_line = max(1, int(first.split('.')[0]) - 2)
-            last_line = int(last.split('.')[0]) + 2
+    # The two halves of highlight_visible_region, for callers that lex the
+    # window text off the Tk thread.
+    def visible_window(self):
+        """Strip tags outside the viewport and return its window.
 
-            start_idx = f'{first_line}.0'
-            end_idx = f'{last_line}.end'
+        Returns ``(start_idx, end_idx, text)`` for the visible lines, or
+        None when they are empty.  Must run on the Tk thread.
+        """
+        # 1. Calculate visible bounds
+        first = self.text.index('@0,0')
+        last = self.text.index(f'@0,{self.text.winfo_height()}')
 
-            # 2. VIRTUALIZE: strip tags from non-visible regions
-            for tag in self._all_tags:
-                self.text.tag_remove(tag, '1.0', start_idx)      # above viewport
-            for tag in self._all_tags:
-                self.text.tag_remove(tag, end_idx, 'end')         # below viewport
+        first_line = max(1, int(first.split('.')[0]) - 2)
+        last_line = int(last.split('.')[0]) + 2
 
-            # 3. Read only the visible portion
-            visible_text = self.text.get(start_idx, end_idx)
-            if not visible_text:
-                return
+        start_idx = f'{first_line}.0'
+        end_idx = f'{last_line}.end'
 
-            # 4. Clear tags in visible region before re-applying
-            for tag in self._all_tags:
-                self.text.tag_remove(tag, start_idx, end_idx)
-
-            lexer = self._get_lexer(language)
-
-            # 5. Lex and apply tags using line.col indices
-            line = first_line
-            col = 0
-            for ttype, value in _lex(visible_text, lexer):
-                if not value:
-                    continue
-                tag = self._tag_name_for_token(ttype)
-                s_line, s_col = line, col
-                lines_in_value = value.split('\n')
-                if len(lines_in_value) == 1:
-                    col += len(value)
-                else:
-                    line += len(lines_in_value) - 1
-                    col = len(lines_in_value[-1])
-                if tag:
-                    try:
-                        self.text.tag_add(tag, f'{s_line}.{s_col}', f'{line}.{col}')
-                    except Exception:
-                        pass
-        except Exception:
-            self.highlight_all(language=language)
+        # 2. VIRTUALIZE: strip tags from non-visible regions.  Only the
+        #    previously tagged window can carry tags, so when it is known
+        #    (marks follow edits) just its overhang is cleared instead of
+        #    1.0 → end.
+        above, below = ('1.0', start_idx), (end_idx, 'end')
+        if self._window_marked:
+            prev_first = self.text.index(_WIN_FIRST)
+            prev_last = self.text.index(_WIN_LAST)
+            above = below = None
+            if self.text.compare(prev_first, '<', start_idx):
+                above = (prev_first, start_idx)
+            if self.text.compare(prev_last, '>', end_idx):
+                below = (end_idx, prev_last)
+        for span in (above, below):
+            if span:
+                for tag in self._all_tags:
+                    self.text.tag_remove(tag, *span)
 
-    def highlight_all(self, language: str = 'cpp'):
+        # 3. Read only the visible portion
+        self.text.mark_set(_WIN_FIRST, start_idx)
+        self.text.mark_gravity(_WIN_FIRST, 'left')  # text typed at the edge stays inside
+        self.text.mark_set(_WIN_LAST, end_idx)
+        self._window_marked = True
+        visible_text = self.text.get(start_idx, end_idx)
+        if not visible_text:
+            return None
+        return start_idx, end_idx, visible_text
+
+    def apply_window(self, window, ranges: Dict[str, list]):
+        """Replace the tags in *window* with *ranges* from ``lex_ranges``."""
+        start_idx, end_idx, _ = window
+        # 4. Clear tags in visible region before re-applying
+        for tag in self._all_tags:
+            self.text.tag_remove(tag, start_idx, end_idx)
+        # 5. Apply the lexed ranges
+        self.apply_ranges(ranges)
+
+    def highlight_all(self, language: str = 'cpp', lexer=None):
         """Highlight the entire content (fallback, not virtualized)."""
+        self._window_marked = False
         for tag in self._all_tags:
             self.text.tag_remove(tag, '1.0', 'end')
         if not PYGMENTS_AVAILABLE:
             return
 
         text = self.text.get('1.0', 'end-1c')
-        lexer = self._get_lexer(language)
+        if lexer is None:
+            lexer = self.get_lexer(language)
 
-        pos = 0
-        for ttype, value in _lex(text, lexer):
-            if not value:
-                continue
-            tag = self._tag_name_for_token(ttype)
-            if not tag:
-                pos += len(value)
-                continue
-            start = pos
-            end = pos + len(value)
-            pos = end
-            try:
-                self.text.tag_add(tag, f'1.0+{start}c', f'1.0+{end}c')
-            except Exception:
-                pass
+        self.apply_ranges(self.lex_ranges(text, lexer))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,35 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cpp_editor import CppEditorApp  # noqa: E402
+
+try:
+    import pygments  # noqa: F401
+except ImportError:
+    pygments = None
+
+
+class _FakeText:
+    """Just enough of tk.Text for SyntaxHighlighter.create_tags."""
+
+    def tag_configure(self, *args, **kw):
+        pass
+
+
+class InitHighlighterTest(unittest.TestCase):
+    @unittest.skipIf(pygments is None, "pygments not installed")
+    def test_highlighter_set_when_pygments_installed(self):
+        refreshed = []
+        editor = SimpleNamespace(text=_FakeText(), highlighter=None,
+                                 update_highlight=lambda: refreshed.append(True))
+        CppEditorApp._init_highlighter(editor)
+        self.assertIsNotNone(editor.highlighter)
+        self.assertEqual(refreshed, [True])
+
+
+if __name__ == '__main__':
+    unittest.main()